@@ -8,6 +8,9 @@ from typing import Optional, Dict
 from functools import lru_cache
 import os
 import logging
+import threading
+
+from cachetools import TTLCache
 
 from py_clob_client.client import ClobClient
 from polymarket_apis.clients.data_client import PolymarketDataClient
@@ -35,35 +38,40 @@ _config: Optional[dict] = None
 _clob_client: Optional[PolymarketClobClient] = None
 _web3_client: Optional[PolymarketWeb3Client] = None
 
-# Cache for order services per wallet
-_order_service_cache: Dict[str, OrderService] = {}
+# Shared HTTP clients reused by every Polymarket API client, so connections
+# and TLS sessions to the CLOB/Data APIs are pooled across all wallets
+_http_client: Optional[httpx.Client] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
 
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=32)
 
-def initialize_services():
-    """
-    Initialize all services on application startup.
+# Cache for order services per wallet (bounded; entries expire so rotated
+# API credentials are picked up again). Services hold no HTTP clients of
+# their own, so nothing needs releasing on eviction.
+ORDER_SERVICE_CACHE_SIZE = 256
+ORDER_SERVICE_CACHE_TTL = 3600  # seconds
 
-    This should be called once when the FastAPI app starts.
-    """
-    global _activity_queue, _position_service, _trading_service, _wallet_service, _order_service, _config
-    global _clob_client, _web3_client
+_order_service_cache: TTLCache = TTLCache(
+    maxsize=ORDER_SERVICE_CACHE_SIZE,
+    ttl=ORDER_SERVICE_CACHE_TTL
+)
+_order_service_cache_lock = threading.RLock()
 
-    # Load configuration
-    _config = load_config()
+# user_wallets configs keyed by lower-cased address and proxy_address,
+# built once on startup so wallet lookups are a single dict access
+_wallet_config_index: Dict[str, dict] = {}
 
-    # Create activity queue
-    queue_config = _config.get('queue', {})
-    queue_type = queue_config.get('type', 'memory')
 
-    if queue_type == 'memory':
-        memory_config = queue_config.get('memory', {})
-        max_workers = memory_config.get('max_workers', 10)
-        _activity_queue = InMemoryActivityQueue(max_workers=max_workers)
-    else:
-        raise NotImplementedError(f"Queue type '{queue_type}' not supported")
+def _init_http_clients(config: dict):
+    """
+    Create the shared HTTP clients from polymarket_api configuration.
 
-    # Get API configuration
-    api_config = _config.get('polymarket_api', {})
+    Args:
+        config: Application configuration
+    """
+    global _http_client, _async_http_client
+
+    api_config = config.get('polymarket_api', {})
     proxy = api_config.get('proxy')
     timeout = api_config.get('timeout', 30.0)
     verify_ssl = api_config.get('verify_ssl', True)
@@ -72,11 +80,12 @@ def initialize_services():
     client_kwargs = {
         "http2": True,
         "timeout": timeout,
-        "verify": verify_ssl
+        "verify": verify_ssl,
+        "limits": HTTP_POOL_LIMITS
     }
     if proxy:
         client_kwargs["proxy"] = proxy
-    
+
     # Suppress SSL warnings if verification is disabled
     if not verify_ssl:
         try:
@@ -85,6 +94,58 @@ def initialize_services():
         except ImportError:
             pass
 
+    _http_client = httpx.Client(**client_kwargs)
+    _async_http_client = httpx.AsyncClient(**client_kwargs)
+
+
+def _build_wallet_config_index(user_wallets: list) -> Dict[str, dict]:
+    """
+    Index wallet configurations by lower-cased address and proxy_address.
+
+    When two wallets share an address, the first one in user_wallets wins.
+
+    Args:
+        user_wallets: List of user wallet configurations
+
+    Returns:
+        Dictionary mapping lower-cased addresses to wallet configurations
+    """
+    index: Dict[str, dict] = {}
+    for wallet in user_wallets:
+        for key in ('address', 'proxy_address'):
+            address = wallet.get(key)
+            if address:
+                index.setdefault(address.lower(), wallet)
+    return index
+
+
+def initialize_services():
+    """
+    Initialize all services on application startup.
+
+    This should be called once when the FastAPI app starts.
+    """
+    global _activity_queue, _position_service, _trading_service, _wallet_service, _order_service, _config
+    global _clob_client, _web3_client, _wallet_config_index
+
+    # Load configuration
+    _config = load_config()
+    _wallet_config_index = _build_wallet_config_index(_config.get('user_wallets', []))
+
+    # Create activity queue
+    queue_config = _config.get('queue', {})
+    queue_type = queue_config.get('type', 'memory')
+
+    if queue_type == 'memory':
+        memory_config = queue_config.get('memory', {})
+        max_workers = memory_config.get('max_workers', 10)
+        _activity_queue = InMemoryActivityQueue(max_workers=max_workers)
+    else:
+        raise NotImplementedError(f"Queue type '{queue_type}' not supported")
+
+    # Create shared HTTP clients from API configuration
+    _init_http_clients(_config)
+
     # Get user wallet configuration (first wallet)
     user_wallets = _config.get('user_wallets', [])
     if not user_wallets:
@@ -104,9 +165,8 @@ def initialize_services():
             "Please configure user_wallets in config.yaml"
         )
     
-    # Create a temporary client with proxy to get API credentials first
-    logger.info("Creating temporary HTTP client to obtain Polymarket API credentials...")
-    temp_client = httpx.Client(**client_kwargs)
+    # Use the shared client (with proxy) to get API credentials first
+    logger.info("Obtaining Polymarket API credentials...")
     
     from polymarket_apis.utilities.signing.signer import Signer
     from polymarket_apis.utilities.headers import create_level_1_headers
@@ -119,7 +179,7 @@ def initialize_services():
     try:
         # Try to create new API key
         logger.info("Attempting to create new Polymarket API key...")
-        response = temp_client.post(
+        response = _http_client.post(
             "https://clob.polymarket.com/auth/api-key",
             headers=headers
         )
@@ -130,7 +190,7 @@ def initialize_services():
         # If creation fails, try to derive existing key
         logger.info(f"API key creation failed ({e}), attempting to derive existing key...")
         try:
-            response = temp_client.get(
+            response = _http_client.get(
                 "https://clob.polymarket.com/auth/derive-api-key",
                 headers=headers
             )
@@ -139,15 +199,11 @@ def initialize_services():
             logger.info("Successfully derived existing API credentials")
         except Exception as derive_error:
             logger.error(f"Failed to obtain API credentials: {derive_error}")
-            temp_client.close()
             raise RuntimeError(
                 "Failed to obtain Polymarket API credentials. "
                 "Please check your network connection and proxy settings."
             ) from derive_error
     
-    temp_client.close()
-    logger.info("Temporary client closed")
-    
     # Now initialize CLOB client with credentials (won't make API call in __init__)
     logger.info("Initializing PolymarketClobClient with obtained credentials...")
     _clob_client = PolymarketClobClient(
@@ -157,9 +213,9 @@ def initialize_services():
         chain_id=137,  # Polygon mainnet
         creds=creds  # Pass credentials to skip API call during init
     )
-    # Replace default clients with configured ones
-    _clob_client.client = httpx.Client(**client_kwargs)
-    _clob_client.async_client = httpx.AsyncClient(**client_kwargs)
+    # Replace default clients with the shared configured ones
+    _clob_client.client = _http_client
+    _clob_client.async_client = _async_http_client
     logger.info("PolymarketClobClient initialized successfully")
     
     # Initialize Web3 client
@@ -175,9 +231,9 @@ def initialize_services():
         chain_id=137  # Polygon mainnet
     )
 
-    # Create Data API client with configured httpx client
+    # Create Data API client with the shared httpx client
     data_client = PolymarketDataClient()
-    data_client.client = httpx.Client(**client_kwargs)
+    data_client.client = _http_client
 
     # Initialize services
     _position_service = PositionService(legacy_clob_client, data_client)
@@ -261,19 +317,13 @@ def get_order_service_for_wallet(wallet_address: str) -> OrderService:
     
     # Check cache first
     wallet_address_lower = wallet_address.lower()
-    if wallet_address_lower in _order_service_cache:
-        return _order_service_cache[wallet_address_lower]
-    
-    # Find wallet configuration
-    user_wallets = _config.get('user_wallets', [])
-    wallet_config = None
+    with _order_service_cache_lock:
+        cached_service = _order_service_cache.get(wallet_address_lower)
+    if cached_service is not None:
+        return cached_service
     
-    for wallet in user_wallets:
-        # Match by address or proxy_address
-        if (wallet.get('address', '').lower() == wallet_address_lower or 
-            wallet.get('proxy_address', '').lower() == wallet_address_lower):
-            wallet_config = wallet
-            break
+    # Find wallet configuration (matches address or proxy_address)
+    wallet_config = _wallet_config_index.get(wallet_address_lower)
     
     if not wallet_config:
         raise ValueError(
@@ -305,24 +355,7 @@ def get_order_service_for_wallet(wallet_address: str) -> OrderService:
         f"(address={wallet_config.get('address')}, signature_type={signature_type})"
     )
     
-    # Get API configuration
-    api_config = _config.get('polymarket_api', {})
-    proxy = api_config.get('proxy')
-    timeout = api_config.get('timeout', 30.0)
-    verify_ssl = api_config.get('verify_ssl', True)
-    
-    # Prepare httpx client kwargs
-    client_kwargs = {
-        "http2": True,
-        "timeout": timeout,
-        "verify": verify_ssl
-    }
-    if proxy:
-        client_kwargs["proxy"] = proxy
-    
-    # Create temporary client to get API credentials
-    temp_client = httpx.Client(**client_kwargs)
-    
+    # Credentials are obtained over the shared HTTP client
     from polymarket_apis.utilities.signing.signer import Signer
     from polymarket_apis.utilities.headers import create_level_1_headers
     from polymarket_apis.types.clob_types import ApiCreds
@@ -333,7 +366,7 @@ def get_order_service_for_wallet(wallet_address: str) -> OrderService:
     try:
         # Try to derive existing API key first (more common scenario)
         logger.info(f"Obtaining API credentials for wallet '{wallet_name}'...")
-        response = temp_client.get(
+        response = _http_client.get(
             "https://clob.polymarket.com/auth/derive-api-key",
             headers=headers
         )
@@ -343,20 +376,17 @@ def get_order_service_for_wallet(wallet_address: str) -> OrderService:
         # If derive fails, try to create new API key
         logger.info(f"Derive failed, creating new API key for wallet '{wallet_name}'...")
         try:
-            response = temp_client.post(
+            response = _http_client.post(
                 "https://clob.polymarket.com/auth/api-key",
                 headers=headers
             )
             response.raise_for_status()
             creds = ApiCreds(**response.json())
         except Exception as create_error:
-            temp_client.close()
             raise RuntimeError(
                 f"Failed to obtain API credentials for wallet '{wallet_name}': {create_error}"
             ) from create_error
     
-    temp_client.close()
-    
     # Initialize CLOB client
     clob_client = PolymarketClobClient(
         private_key=private_key,
@@ -365,8 +395,8 @@ def get_order_service_for_wallet(wallet_address: str) -> OrderService:
         chain_id=137,
         creds=creds
     )
-    clob_client.client = httpx.Client(**client_kwargs)
-    clob_client.async_client = httpx.AsyncClient(**client_kwargs)
+    clob_client.client = _http_client
+    clob_client.async_client = _async_http_client
     
     # Initialize Web3 client
     web3_client = PolymarketWeb3Client(
@@ -400,8 +430,9 @@ def get_order_service_for_wallet(wallet_address: str) -> OrderService:
         wallet_address=operation_address
     )
     
-    # Cache the service
-    _order_service_cache[wallet_address_lower] = order_service
+    # Cache the service (keep the first one if another request raced us)
+    with _order_service_cache_lock:
+        order_service = _order_service_cache.setdefault(wallet_address_lower, order_service)
     
     logger.info(f"OrderService created and cached for wallet '{wallet_name}'")
     
@@ -8,13 +8,17 @@ class ActivityQueue(ABC):
     """Message queue abstract base class for real-time wallet activity distribution."""
 
     @abstractmethod
-    def enqueue(self, wallet_address: str, activities: List[dict]):
+    def enqueue(self, wallet_address: str, activities: List[dict]) -> bool:
         """
         Enqueue activity list.
 
         Args:
             wallet_address: Wallet address
             activities: Activity data list
+
+        Returns:
+            False if the activities were not delivered and should be fetched
+            again, True otherwise
         """
         pass
 
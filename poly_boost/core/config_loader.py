@@ -1,11 +1,42 @@
 """Configuration loading utilities."""
 
+import copy
+import functools
 import os
 from pathlib import Path
 
 import yaml
 from dotenv import load_dotenv
 
+# Use the libyaml C loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Deletion table for hex digits: anything left after str.translate() is non-hex
+_HEX_DIGITS = str.maketrans('', '', '0123456789abcdefABCDEF')
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_config_file(config_path: Path, mtime_ns: int, size: int):
+    """
+    Parse a YAML configuration file.
+
+    Cached per (path, modification time, size), so an edited file is
+    re-parsed while repeated loads of an unchanged file skip YAML parsing.
+
+    Args:
+        config_path: Resolved configuration file path
+        mtime_ns: File modification time, used only as part of the cache key
+        size: File size in bytes, used only as part of the cache key
+
+    Returns:
+        Parsed YAML content (shared; callers must not mutate it)
+    """
+    with open(config_path, 'r', encoding='utf-8') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
 
 def load_config(path: str = "config/config.yaml") -> dict:
     """
@@ -41,8 +72,9 @@ def load_config(path: str = "config/config.yaml") -> dict:
     if not config_path.exists():
         raise FileNotFoundError(f"Configuration file does not exist: {path}")
 
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+    # Validation fills in defaults in place, so work on a private copy
+    stat = config_path.stat()
+    config = copy.deepcopy(_parse_config_file(config_path, stat.st_mtime_ns, stat.st_size))
 
     if not config:
         raise ValueError(f"Configuration file is empty or has invalid format: {path}")
@@ -161,6 +193,14 @@ def load_private_key(wallet_config: dict) -> str:
             raise ValueError(
                 f"Environment variable '{env_var}' not set, cannot load wallet '{wallet_config['name']}' private key"
             )
+
+        # Cheap format check before the key ever reaches the crypto layer
+        key_hex = key[2:] if key[:2] in ('0x', '0X') else key
+        if len(key_hex) != 64 or key_hex.translate(_HEX_DIGITS):
+            raise ValueError(
+                f"Environment variable '{env_var}' does not contain a valid private key for wallet "
+                f"'{wallet_config['name']}' (expected 64 hex characters, optionally prefixed with 0x)"
+            )
         return key
     else:
         raise ValueError(
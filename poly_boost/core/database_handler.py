@@ -4,8 +4,6 @@ from datetime import datetime
 from typing import Optional
 from urllib.parse import urlparse
 
-from peewee import IntegrityError
-
 from poly_boost.core.models import db, Trade, WalletCheckpoint
 
 
@@ -52,19 +50,16 @@ class DatabaseHandler:
         if not trades_data:
             return 0
 
-        new_count = 0
-
-        # Batch insert within transaction
+        # Single INSERT ... ON CONFLICT DO NOTHING RETURNING within transaction;
+        # trades that already exist (primary key conflict) are skipped
         with db.atomic():
-            for trade in trades_data:
-                try:
-                    Trade.create(**trade)
-                    new_count += 1
-                except IntegrityError:
-                    # Primary key conflict, trade already exists, skip
-                    continue
-
-        return new_count
+            inserted = (
+                Trade.insert_many(trades_data)
+                .on_conflict_ignore()
+                .returning(Trade.transaction_hash)
+                .execute()
+            )
+            return len(list(inserted))
 
     @staticmethod
     def get_checkpoint(wallet_address: str) -> Optional[datetime]:
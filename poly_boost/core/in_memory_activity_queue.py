@@ -1,8 +1,10 @@
 """In-memory activity queue implementation."""
 
+import threading
+import time
 from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, List
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, List, Optional, Set
 
 from poly_boost.core.activity_queue import ActivityQueue
 from poly_boost.core.logger import log
@@ -11,45 +13,122 @@ from poly_boost.core.logger import log
 class InMemoryActivityQueue(ActivityQueue):
     """In-memory activity queue implementation for development and testing."""
 
-    def __init__(self, max_workers: int = 10):
+    def __init__(
+        self,
+        max_workers: int = 10,
+        max_pending: int = 1024,
+        submit_timeout: Optional[float] = None
+    ):
         """
         Initialize in-memory queue.
 
         Args:
             max_workers: Maximum number of worker threads for callback execution
+            max_pending: Maximum number of callback tasks queued or running at once
+            submit_timeout: Seconds enqueue() waits for a free slot before dropping a
+                notification. None (default) blocks until a slot frees up, so no
+                notification is ever dropped
         """
         self.subscribers = defaultdict(list)
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
-        log.info(f"InMemoryActivityQueue initialized with max workers: {max_workers}")
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="activity-queue")
+        self.max_pending = max_pending
+        self.submit_timeout = submit_timeout
+        # Bounds the executor's internal work queue so bursts cannot grow it without limit
+        self._slots = threading.BoundedSemaphore(max_pending)
+        # Serialises multi-slot reservations in enqueue()
+        self._reserve_lock = threading.Lock()
+        # Callback tasks submitted but not yet finished, for flush()
+        self._pending: Set[Future] = set()
+        self._pending_lock = threading.Lock()
+        log.info(
+            f"InMemoryActivityQueue initialized with max workers: {max_workers}, "
+            f"max pending callbacks: {max_pending}"
+        )
 
-    def enqueue(self, wallet_address: str, activities: List[dict]):
+    def enqueue(self, wallet_address: str, activities: List[dict]) -> bool:
         """
         Enqueue activity list and notify all subscribers.
 
+        Blocks while max_pending callbacks are already queued or running
+        (backpressure on the producer). Delivery is all-or-nothing across the
+        wallet's subscribers.
+
         Args:
             wallet_address: Wallet address
             activities: Activity data list
+
+        Returns:
+            False if the batch was delivered to no subscriber and should be fetched
+            again (only possible when submit_timeout is set), True otherwise
         """
         if not activities:
-            return
+            return True
 
         # Check if there are subscribers
         if wallet_address not in self.subscribers or not self.subscribers[wallet_address]:
             log.debug(f"Wallet {wallet_address} has no subscribers, skipping notification")
-            return
+            return True
+
+        callbacks = list(self.subscribers[wallet_address])
 
         log.info(
             f"Wallet {wallet_address}: Enqueued {len(activities)} activity(ies), "
-            f"notifying {len(self.subscribers[wallet_address])} subscriber(s)"
+            f"notifying {len(callbacks)} subscriber(s)"
         )
 
+        # Reserve a slot for every subscriber before submitting anything, so a
+        # batch is either delivered to all subscribers or to none of them
+        if not self._reserve_slots(len(callbacks)):
+            log.error(
+                f"Wallet {wallet_address}: {self.max_pending} callbacks still pending after "
+                f"{self.submit_timeout}s, dropping notification of {len(activities)} activity(ies)"
+            )
+            return False
+
         # Asynchronously notify all subscribers
-        for callback in self.subscribers[wallet_address]:
+        for submitted, callback in enumerate(callbacks):
             try:
                 # Use thread pool to execute callback, avoid blocking
-                self.executor.submit(self._execute_callback, callback, activities, wallet_address)
+                future = self.executor.submit(self._execute_callback, callback, activities, wallet_address)
             except Exception as e:
+                # Free the slots reserved for this and the remaining subscribers
+                self._release_slots(len(callbacks) - submitted)
                 log.error(f"Failed to submit callback task: {e}")
+                # Only ask for a refetch if no subscriber received the batch
+                return submitted > 0
+
+            with self._pending_lock:
+                self._pending.add(future)
+            future.add_done_callback(self._callback_done)
+
+        return True
+
+    def _reserve_slots(self, count: int) -> bool:
+        """
+        Acquire count callback slots, waiting at most submit_timeout in total.
+
+        Reservations are serialised so two producers cannot each hold part of
+        the slots they need and wait on each other. On timeout every slot taken
+        so far is released again.
+
+        Returns:
+            True if all slots were acquired, False on timeout
+        """
+        deadline = None if self.submit_timeout is None else time.monotonic() + self.submit_timeout
+        acquired = 0
+        with self._reserve_lock:
+            while acquired < count:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                if not self._slots.acquire(timeout=timeout):
+                    self._release_slots(acquired)
+                    return False
+                acquired += 1
+        return True
+
+    def _release_slots(self, count: int):
+        """Return count unused callback slots."""
+        for _ in range(count):
+            self._slots.release()
 
     def subscribe(self, wallet_address: str, callback: Callable[[List[dict]], None]):
         """
@@ -58,13 +137,42 @@ class InMemoryActivityQueue(ActivityQueue):
         Args:
             wallet_address: Wallet address
             callback: Callback function that receives activity list as parameter
+
+        Raises:
+            ValueError: The wallet already has max_pending subscribers
         """
+        if len(self.subscribers[wallet_address]) >= self.max_pending:
+            raise ValueError(
+                f"Wallet {wallet_address} already has {self.max_pending} subscribers, "
+                f"the most one batch can be delivered to (max_pending)"
+            )
         self.subscribers[wallet_address].append(callback)
         log.info(
             f"New subscriber added to wallet: {wallet_address}, "
             f"current subscriber count: {len(self.subscribers[wallet_address])}"
         )
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every callback enqueued so far has finished.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if all callbacks finished, False if the timeout expired first
+        """
+        with self._pending_lock:
+            pending = list(self._pending)
+        _, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def _callback_done(self, future: Future):
+        """Drop a finished callback task from the pending set and free its slot."""
+        with self._pending_lock:
+            self._pending.discard(future)
+        self._slots.release()
+
     def _execute_callback(self, callback: Callable, activities: List[dict], wallet_address: str):
         """
         Execute callback function, capture and log exceptions.
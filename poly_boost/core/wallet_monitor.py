@@ -78,6 +78,13 @@ class WalletMonitor:
         self.stop_event = threading.Event()
         self.executor: Optional[ThreadPoolExecutor] = None
 
+        # Set once every wallet has completed its first poll
+        self._first_cycle_done = threading.Event()
+        self._first_cycle_pending = len(wallets)
+        self._first_cycle_lock = threading.Lock()
+        if not wallets:
+            self._first_cycle_done.set()
+
         log.info(f"WalletMonitor initialized, monitoring {len(wallets)} wallet(s)")
 
     def start(self):
@@ -103,6 +110,25 @@ class WalletMonitor:
 
         log.info("Monitoring stopped")
 
+    def wait_first_cycle(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every wallet has completed its first poll.
+
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
+
+        Returns:
+            True if the first cycle completed, False on timeout
+        """
+        return self._first_cycle_done.wait(timeout)
+
+    def _mark_first_cycle(self):
+        """Count down one wallet's first poll and release waiters after the last."""
+        with self._first_cycle_lock:
+            self._first_cycle_pending -= 1
+            if self._first_cycle_pending == 0:
+                self._first_cycle_done.set()
+
     def _monitor_wallet(self, wallet_address: str):
         """
         Monitor a single wallet (runs in dedicated thread).
@@ -122,6 +148,7 @@ class WalletMonitor:
             f"monitoring activities after this time"
         )
 
+        first_cycle = True
         while not self.stop_event.is_set():
             try:
                 total_activities, updated_checkpoint = self._fetch_and_publish_activities(
@@ -144,6 +171,10 @@ class WalletMonitor:
             except Exception as e:
                 log.error(f"Error monitoring wallet {wallet_address}: {e}", exc_info=True)
 
+            if first_cycle:
+                first_cycle = False
+                self._mark_first_cycle()
+
             # Wait for next poll
             self.stop_event.wait(self.poll_interval)
 
@@ -198,8 +229,14 @@ class WalletMonitor:
             # Log activity summary
             log_activities(wallet_address, activities)
 
-            # Push activities to message queue
-            self.activity_queue.enqueue(wallet_address, activities)
+            # Push activities to message queue; if they were not delivered, keep the
+            # checkpoint before this batch so the next poll fetches it again
+            if self.activity_queue.enqueue(wallet_address, activities) is False:
+                log.warning(
+                    f"Wallet {wallet_address}: Activity batch not delivered, "
+                    f"will retry from the current checkpoint"
+                )
+                break
             total_activities += len(activities)
 
             # Update checkpoint to the latest activity timestamp in this batch
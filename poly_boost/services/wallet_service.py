@@ -13,6 +13,14 @@ from py_clob_client.client import ClobClient
 
 logger = logging.getLogger(__name__)
 
+# Pre-built shape for get_wallet_info(); copied per call instead of rebuilt
+_INFO_TEMPLATE: Dict[str, Any] = {
+    "address": "",
+    "name": "Unknown",
+    "proxy_address": None,
+    "is_managed": False,
+}
+
 
 class WalletService:
     """Service for managing wallet information."""
@@ -25,7 +33,7 @@ class WalletService:
             clob_client: Polymarket CLOB client instance
         """
         self.clob_client = clob_client
-        self.managed_wallets: Dict[str, dict] = {}  # address -> wallet_config
+        self.managed_wallets: Dict[str, dict] = {}  # lower-cased address -> wallet_config
 
     def register_wallet(self, wallet_config: dict) -> str:
         """
@@ -44,7 +52,8 @@ class WalletService:
         if not address:
             raise ValueError("Wallet configuration must include 'address' field")
 
-        self.managed_wallets[address] = wallet_config
+        # Normalize once here so lookups accept any address casing
+        self.managed_wallets[address.lower()] = wallet_config
         logger.info(f"Wallet registered: {address}")
         return address
 
@@ -58,14 +67,16 @@ class WalletService:
         Returns:
             Wallet information dictionary
         """
-        wallet_config = self.managed_wallets.get(wallet_address, {})
+        info = _INFO_TEMPLATE.copy()
+        info["address"] = wallet_address
+
+        wallet_config = self.managed_wallets.get(wallet_address.lower())
+        if wallet_config is not None:
+            info["name"] = wallet_config.get("name", "Unknown")
+            info["proxy_address"] = wallet_config.get("proxy_address")
+            info["is_managed"] = True
 
-        return {
-            "address": wallet_address,
-            "name": wallet_config.get("name", "Unknown"),
-            "proxy_address": wallet_config.get("proxy_address"),
-            "is_managed": wallet_address in self.managed_wallets
-        }
+        return info
 
     def get_balance(self, wallet_address: str) -> Decimal:
         """
@@ -99,6 +110,6 @@ class WalletService:
             List of wallet information dictionaries
         """
         return [
-            self.get_wallet_info(address)
-            for address in self.managed_wallets.keys()
+            self.get_wallet_info(wallet_config["address"])
+            for wallet_config in self.managed_wallets.values()
         ]
@@ -0,0 +1,23 @@
+"""
+Launcher for the CLI and the Telegram bot.
+
+Run with: python run.py cli
+      or: python run.py bot
+Once the package is installed, the poly-boost-cli and poly-boost-bot
+console scripts do the same without this file.
+"""
+
+import sys
+
+TARGETS = {
+    "cli": "poly_boost.cli",
+    "bot": "poly_boost.bot.main",
+}
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] not in TARGETS:
+        print(f"Usage: python run.py {{{'|'.join(TARGETS)}}}", file=sys.stderr)
+        sys.exit(2)
+
+    from importlib import import_module
+    import_module(TARGETS[sys.argv.pop(1)]).main()
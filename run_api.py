@@ -2,8 +2,15 @@
 FastAPI launcher script.
 
 Run with: python run_api.py
+
+Set ENV=dev to run with auto-reload. Otherwise the server runs without the
+file watcher, on uvloop (faster event loop) and httptools (C HTTP parser)
+where available. API_WORKERS sets the worker process count; it defaults to 1
+because copy-trading state (activity queue, running traders) is held in
+process memory and is not shared between workers.
 """
 
+import os
 import sys
 from pathlib import Path
 
@@ -14,4 +21,18 @@ if str(project_root) not in sys.path:
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("poly_boost.api.main:app", host="0.0.0.0", port=8000, reload=True)
+
+    if os.getenv("ENV") == "dev":
+        uvicorn.run("poly_boost.api.main:app", host="0.0.0.0", port=8000, reload=True, workers=1)
+    else:
+        # uvloop is not available on Windows
+        loop = "asyncio" if sys.platform == "win32" else "uvloop"
+        uvicorn.run(
+            "poly_boost.api.main:app",
+            host="0.0.0.0",
+            port=8000,
+            workers=int(os.getenv("API_WORKERS", "1")),
+            loop=loop,
+            http="httptools",
+            reload=False
+        )
@@ -1,162 +1,374 @@
 #!/usr/bin/env python3
 """直接检查链上的 allowance 状态（不通过 API）"""
 
+import argparse
+import asyncio
+import functools
+import io
+import sqlite3
 import sys
-from web3 import Web3
+from pathlib import Path
+
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
 
 # Polygon 配置
 POLYGON_RPC_URL = "https://polygon-rpc.com"
 CHAIN_ID = 137
 
-# 合约地址
-USDC_ADDRESS = "0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174"
-CONDITIONAL_TOKENS_ADDRESS = "0x4D97DCd97eC945f40cF65F87097ACe5EA0476045"
+# eth_call 结果缓存（按区块号区分，同一区块内重复运行不再请求 RPC）
+# 只保留最近一个区块的结果，文件大小以单次运行的调用数量为上限
+RPC_CACHE_PATH = Path.home() / ".poly_boost" / "rpc_cache.db"
+
+# 合约地址（模块加载时一次性计算 checksum，后续直接使用）
+USDC_ADDRESS = Web3.to_checksum_address("0x2791Bca1f2de4661ED88A30C99A7a9449Aa84174")
+CONDITIONAL_TOKENS_ADDRESS = Web3.to_checksum_address("0x4D97DCd97eC945f40cF65F87097ACe5EA0476045")
 
 # 交易所合约地址
 EXCHANGE_ADDRESSES = [
-    "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E",
-    "0xC5d563A36AE78145C45a50134d48A1215220f80a",
-    "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296",
+    Web3.to_checksum_address(address) for address in (
+        "0x4bFb41d5B3570DeFd03C39a9A4D8dE6Bd8B8982E",
+        "0xC5d563A36AE78145C45a50134d48A1215220f80a",
+        "0xd91E80cF2E7be2e162c6513ceD06f1dD0dA35296",
+    )
 ]
 
-# ERC20 ABI (只需要 allowance 和 balanceOf)
-ERC20_ABI = [
-    {
-        "constant": True,
-        "inputs": [
-            {"name": "_owner", "type": "address"},
-            {"name": "_spender", "type": "address"}
-        ],
-        "name": "allowance",
-        "outputs": [{"name": "", "type": "uint256"}],
-        "type": "function"
-    },
-    {
-        "constant": True,
-        "inputs": [{"name": "_owner", "type": "address"}],
-        "name": "balanceOf",
-        "outputs": [{"name": "", "type": "uint256"}],
-        "type": "function"
-    }
-]
+# 函数选择器: keccak(函数签名)[:4]，直接拼接调用数据，跳过 ABI 编码
+BALANCE_OF_SELECTOR = bytes.fromhex("70a08231")           # balanceOf(address)
+ALLOWANCE_SELECTOR = bytes.fromhex("dd62ed3e")            # allowance(address,address)
+IS_APPROVED_FOR_ALL_SELECTOR = bytes.fromhex("e985e9c5")  # isApprovedForAll(address,address)
+
+# Multicall3（Polygon 上已部署，所有链地址相同）
+MULTICALL3_ADDRESS = Web3.to_checksum_address("0xcA11bde05977b3631167028862bE2a173976CA11")
 
-# ERC1155 ABI
-ERC1155_ABI = [
+# Multicall3 ABI (只需要 aggregate3)
+MULTICALL3_ABI = [
     {
-        "constant": True,
         "inputs": [
-            {"name": "_owner", "type": "address"},
-            {"name": "_operator", "type": "address"}
+            {
+                "components": [
+                    {"name": "target", "type": "address"},
+                    {"name": "allowFailure", "type": "bool"},
+                    {"name": "callData", "type": "bytes"}
+                ],
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"name": "success", "type": "bool"},
+                    {"name": "returnData", "type": "bytes"}
+                ],
+                "name": "returnData",
+                "type": "tuple[]"
+            }
         ],
-        "name": "isApprovedForAll",
-        "outputs": [{"name": "", "type": "bool"}],
+        "stateMutability": "payable",
         "type": "function"
     }
 ]
 
-def check_onchain_allowances():
+def address_word(checksum_addr):
+    """地址左侧补零为 32 字节的 ABI 参数"""
+    return bytes.fromhex(checksum_addr[2:]).rjust(32, b"\x00")
+
+def balance_of_calldata(checksum_addr):
+    """构造 balanceOf(address) 调用数据"""
+    return BALANCE_OF_SELECTOR + address_word(checksum_addr)
+
+def allowance_calldata(owner, spender):
+    """构造 allowance(address,address) 调用数据"""
+    return ALLOWANCE_SELECTOR + address_word(owner) + address_word(spender)
+
+def is_approved_for_all_calldata(owner, operator):
+    """构造 isApprovedForAll(address,address) 调用数据"""
+    return IS_APPROVED_FOR_ALL_SELECTOR + address_word(owner) + address_word(operator)
+
+def format_usdc(raw):
+    """把 USDC 原始值（6 位小数）格式化为金额字符串，只用整数运算
+
+    无限授权（type(uint256).max 一类的超大值）显示为 ∞
+    """
+    if raw >> 200:
+        return "∞"
+    whole, frac = divmod(raw, 1_000_000)
+    return f"{whole}.{frac // 10_000:02d}"
+
+@functools.cache
+def get_multicall_contract(w3):
+    """每个 Web3 实例只解析一次 Multicall3 ABI，之后复用同一个合约对象"""
+    return w3.eth.contract(address=MULTICALL3_ADDRESS, abi=MULTICALL3_ABI)
+
+class RpcCallCache:
+    """
+    按 (to, data, blockNumber) 缓存 eth_call 结果的 SQLite 存储
+
+    写入新区块的结果时删除其他区块的旧记录，缓存中始终只有一个区块的数据。
+    缓存只是加速手段：读写出错时打印一次警告并停用缓存，检查照常进行。
+    """
+
+    def __init__(self, path=RPC_CACHE_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS eth_call ("
+            "target TEXT, data TEXT, block INTEGER, result BLOB, "
+            "PRIMARY KEY (target, data, block))"
+        )
+        # 已清理过旧记录的区块，同一区块内只清理一次
+        self._pruned_block = None
+
+    @classmethod
+    def open(cls, path=RPC_CACHE_PATH):
+        """打开缓存，失败时打印警告并返回 None（不使用缓存继续检查）"""
+        try:
+            return cls(path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"WARNING: 无法打开 eth_call 缓存 ({path})，将不使用缓存: {e}")
+            return None
+
+    def _disable(self, error):
+        print(f"WARNING: eth_call 缓存读写失败，本次运行不再使用缓存: {error}")
+        self.close()
+        self.conn = None
+
+    def get(self, target, data_hex, block):
+        if self.conn is None:
+            return None
+        try:
+            row = self.conn.execute(
+                "SELECT result FROM eth_call WHERE target = ? AND data = ? AND block = ?",
+                (target, data_hex, block)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._disable(e)
+            return None
+        return row[0] if row else None
+
+    def put(self, target, data_hex, block, result):
+        if self.conn is None:
+            return
+        try:
+            if block != self._pruned_block:
+                self.conn.execute("DELETE FROM eth_call WHERE block <> ?", (block,))
+                self._pruned_block = block
+            self.conn.execute(
+                "INSERT OR REPLACE INTO eth_call (target, data, block, result) VALUES (?, ?, ?, ?)",
+                (target, data_hex, block, result)
+            )
+            self.conn.commit()
+        except sqlite3.Error as e:
+            self._disable(e)
+
+    def close(self):
+        if self.conn is not None:
+            try:
+                self.conn.close()
+            except sqlite3.Error:
+                pass
+
+async def cached_eth_call(w3, cache, target, calldata, block):
+    """在指定区块执行 eth_call，cache 不为 None 时先查缓存"""
+    data_hex = calldata.hex()
+    if cache is not None:
+        result = cache.get(target, data_hex, block)
+        if result is not None:
+            return result
+
+    result = bytes(await w3.eth.call({"to": target, "data": calldata}, block))
+
+    if cache is not None:
+        cache.put(target, data_hex, block, result)
+    return result
+
+async def try_eth_call(w3, cache, target, calldata, block):
+    """单独执行一个 eth_call，返回与 aggregate3 相同的 (success, returnData)"""
+    try:
+        return True, await cached_eth_call(w3, cache, target, calldata, block)
+    except Exception:
+        return False, b""
+
+async def aggregate_values(w3, cache, block, multicall_contract, calls):
+    """
+    通过 Multicall3 aggregate3 在一次 eth_call 中执行 calls
+
+    Multicall3 不可用时，改为并发发送各个 eth_call（asyncio.gather）。
+    返回每个子调用的 32 字节返回值（按整数解码），失败时为 None
+    """
+    try:
+        multicall_data = Web3.to_bytes(hexstr=multicall_contract.encode_abi("aggregate3", args=[calls]))
+        raw = await cached_eth_call(w3, cache, multicall_contract.address, multicall_data, block)
+        results = w3.codec.decode(["(bool,bytes)[]"], raw)[0]
+    except Exception as e:
+        print(f"WARN: Multicall 查询失败 ({e})，改为并发单独查询\n")
+        results = await asyncio.gather(
+            *(try_eth_call(w3, cache, target, calldata, block) for target, _, calldata in calls)
+        )
+
+    # uint256 和 bool 返回值都是单个 32 字节字
+    return [int.from_bytes(data, "big") if success else None for success, data in results]
+
+async def fetch_allowance_states(w3, cache, block, multicall_contract, checksum_addrs):
+    """
+    分两阶段查询所有地址的余额和授权状态
+
+    第一阶段一次 aggregate3 查询全部余额；第二阶段只为余额非零（或查询失败）
+    的地址查询授权，余额为 0 的地址不再发出授权查询。
+    所有调用都固定在同一区块 block，结果可按区块缓存。
+
+    返回 {地址: (USDC 余额, USDC 授权额度列表, CT 授权状态列表)}，
+    列表顺序与 EXCHANGE_ADDRESSES 一致；子调用失败时对应值为 None，
+    跳过授权查询的地址两个列表都为 None
+    """
+    balance_calls = [(USDC_ADDRESS, True, balance_of_calldata(addr)) for addr in checksum_addrs]
+    balances = await aggregate_values(w3, cache, block, multicall_contract, balance_calls)
+    states = {addr: (balance, None, None) for addr, balance in zip(checksum_addrs, balances)}
+
+    funded = [addr for addr, balance in zip(checksum_addrs, balances) if balance != 0]
+    if not funded:
+        return states
+
+    calls = []
+    for addr in funded:
+        for exchange in EXCHANGE_ADDRESSES:
+            calls.append((USDC_ADDRESS, True, allowance_calldata(addr, exchange)))
+        for exchange in EXCHANGE_ADDRESSES:
+            calls.append((CONDITIONAL_TOKENS_ADDRESS, True, is_approved_for_all_calldata(addr, exchange)))
+
+    values = await aggregate_values(w3, cache, block, multicall_contract, calls)
+
+    count = len(EXCHANGE_ADDRESSES)
+    stride = 2 * count
+    for n, addr in enumerate(funded):
+        chunk = values[n * stride:(n + 1) * stride]
+        approvals = [None if v is None else bool(v) for v in chunk[count:]]
+        states[addr] = (states[addr][0], chunk[:count], approvals)
+    return states
+
+def render_address_report(addr_name, address, state):
+    """把单个地址的余额和授权状态渲染为报告文本"""
+    out = io.StringIO()
+
+    print(f"{'='*60}", file=out)
+    print(f"检查 {addr_name} 地址: {address}", file=out)
+    print(f"{'='*60}\n", file=out)
+
+    balance_raw, allowances, approvals = state
+
+    # 1. USDC 余额
+    if balance_raw is None:
+        print("ERROR: 查询余额失败\n", file=out)
+        balance_raw = 0
+    else:
+        print(f"USDC 余额: ${format_usdc(balance_raw)}\n", file=out)
+
+    # 余额为 0 时未查询授权
+    if allowances is None:
+        print(f"[INFO] {addr_name} address has zero balance, skipped allowance checks\n", file=out)
+        return out.getvalue()
+
+    # 2. USDC 授权
+    print("USDC Allowances (授权给交易所):", file=out)
+    has_usdc_allowance = False
+    for i, allowance_raw in enumerate(allowances, 1):
+        if allowance_raw is None:
+            print(f"  Exchange {i}: ERROR - 调用失败", file=out)
+            continue
+
+        status = "[OK] Approved" if allowance_raw > 0 else "[NO] Not approved"
+        print(f"  Exchange {i}: {status} (${format_usdc(allowance_raw)})", file=out)
+
+        if allowance_raw > 0:
+            has_usdc_allowance = True
+
+    print(file=out)
+
+    # 3. Conditional Tokens 授权
+    print("Conditional Tokens Approvals (授权给交易所):", file=out)
+    has_ct_approval = False
+    for i, is_approved in enumerate(approvals, 1):
+        if is_approved is None:
+            print(f"  Exchange {i}: ERROR - 调用失败", file=out)
+            continue
+
+        status = "[OK] Approved" if is_approved else "[NO] Not approved"
+        print(f"  Exchange {i}: {status}", file=out)
+
+        if is_approved:
+            has_ct_approval = True
+
+    print(file=out)
+
+    # 总结
+    if balance_raw > 0:
+        if has_usdc_allowance and has_ct_approval:
+            print(f"[OK] {addr_name} address is fully configured and ready to trade", file=out)
+        elif not has_usdc_allowance and not has_ct_approval:
+            print(f"[NO] {addr_name} address NOT approved, need to Enable Trading", file=out)
+        else:
+            print(f"[WARN] {addr_name} address partially approved, recommend re-Enable Trading", file=out)
+    else:
+        print(f"[INFO] {addr_name} address has zero balance, no approval needed", file=out)
+
+    print(file=out)
+
+    return out.getvalue()
+
+async def check_onchain_allowances(use_cache=True):
     """检查链上的授权状态"""
     print("=== 链上 Allowance 检查 ===\n")
 
     # 您的地址
-    EOA_ADDRESS = "0x7c194708d0b203b00c57c001cda31eeb8e961aa7"
-    PROXY_ADDRESS = "0x2173D82638Bd32328cc3A1118408A2a577ea2869"
+    EOA_ADDRESS = Web3.to_checksum_address("0x7c194708d0b203b00c57c001cda31eeb8e961aa7")
+    PROXY_ADDRESS = Web3.to_checksum_address("0x2173D82638Bd32328cc3A1118408A2a577ea2869")
 
     print(f"EOA 地址: {EOA_ADDRESS}")
     print(f"Proxy 地址: {PROXY_ADDRESS}\n")
 
-    # 连接到 Polygon
-    w3 = Web3(Web3.HTTPProvider(POLYGON_RPC_URL))
+    # 连接到 Polygon（异步 provider 复用同一个 HTTP 会话）
+    w3 = AsyncWeb3(AsyncHTTPProvider(POLYGON_RPC_URL))
+    cache = RpcCallCache.open() if use_cache else None
+
+    try:
+        return await report_allowances(w3, cache, EOA_ADDRESS, PROXY_ADDRESS)
+    finally:
+        if cache is not None:
+            cache.close()
+        await w3.provider.disconnect()
 
-    if not w3.is_connected():
+async def report_allowances(w3, cache, eoa_address, proxy_address):
+    """查询并打印两个地址的授权状态（地址须已是 checksum 格式）"""
+    if not await w3.is_connected():
         print("ERROR: 无法连接到 Polygon 网络")
         return False
 
-    print(f"Connected to Polygon (Chain ID: {w3.eth.chain_id})\n")
-
-    # 创建合约实例
-    usdc_contract = w3.eth.contract(
-        address=Web3.to_checksum_address(USDC_ADDRESS),
-        abi=ERC20_ABI
-    )
+    print(f"Connected to Polygon (Chain ID: {await w3.eth.chain_id})\n")
 
-    ct_contract = w3.eth.contract(
-        address=Web3.to_checksum_address(CONDITIONAL_TOKENS_ADDRESS),
-        abi=ERC1155_ABI
-    )
+    # 所有查询固定在当前区块，保证快照一致且可缓存
+    block = await w3.eth.block_number
 
-    # 检查两个地址
-    for addr_name, address in [("EOA", EOA_ADDRESS), ("Proxy", PROXY_ADDRESS)]:
-        print(f"{'='*60}")
-        print(f"检查 {addr_name} 地址: {address}")
-        print(f"{'='*60}\n")
+    multicall_contract = get_multicall_contract(w3)
 
-        checksum_addr = Web3.to_checksum_address(address)
+    addresses = [("EOA", eoa_address), ("Proxy", proxy_address)]
 
-        # 1. 检查 USDC 余额
-        try:
-            balance_raw = usdc_contract.functions.balanceOf(checksum_addr).call()
-            balance = balance_raw / 1_000_000
-            print(f"USDC 余额: ${balance:.2f}\n")
-        except Exception as e:
-            print(f"ERROR: 查询余额失败: {e}\n")
-            balance = 0
-
-        # 2. 检查 USDC 授权
-        print("USDC Allowances (授权给交易所):")
-        has_usdc_allowance = False
-        for i, exchange in enumerate(EXCHANGE_ADDRESSES, 1):
-            try:
-                checksum_exchange = Web3.to_checksum_address(exchange)
-                allowance_raw = usdc_contract.functions.allowance(
-                    checksum_addr,
-                    checksum_exchange
-                ).call()
-                allowance = allowance_raw / 1_000_000
-
-                status = "[OK] Approved" if allowance > 0 else "[NO] Not approved"
-                print(f"  Exchange {i}: {status} (${allowance:.2f})")
-
-                if allowance > 0:
-                    has_usdc_allowance = True
-            except Exception as e:
-                print(f"  Exchange {i}: ERROR - {e}")
-
-        print()
-
-        # 3. 检查 Conditional Tokens 授权
-        print("Conditional Tokens Approvals (授权给交易所):")
-        has_ct_approval = False
-        for i, exchange in enumerate(EXCHANGE_ADDRESSES, 1):
-            try:
-                checksum_exchange = Web3.to_checksum_address(exchange)
-                is_approved = ct_contract.functions.isApprovedForAll(
-                    checksum_addr,
-                    checksum_exchange
-                ).call()
-
-                status = "[OK] Approved" if is_approved else "[NO] Not approved"
-                print(f"  Exchange {i}: {status}")
-
-                if is_approved:
-                    has_ct_approval = True
-            except Exception as e:
-                print(f"  Exchange {i}: ERROR - {e}")
-
-        print()
-
-        # 总结
-        if balance > 0:
-            if has_usdc_allowance and has_ct_approval:
-                print(f"[OK] {addr_name} address is fully configured and ready to trade")
-            elif not has_usdc_allowance and not has_ct_approval:
-                print(f"[NO] {addr_name} address NOT approved, need to Enable Trading")
-            else:
-                print(f"[WARN] {addr_name} address partially approved, recommend re-Enable Trading")
-        else:
-            print(f"[INFO] {addr_name} address has zero balance, no approval needed")
+    # 先批量查余额，再只为有余额的地址批量查授权（同一区块快照）
+    try:
+        states = await fetch_allowance_states(
+            w3,
+            cache,
+            block,
+            multicall_contract,
+            [address for _, address in addresses]
+        )
+    except Exception as e:
+        print(f"ERROR: 链上查询失败: {e}")
+        return False
 
-        print()
+    # 各地址的报告互不依赖，分别渲染到独立缓冲区后按固定顺序输出
+    for addr_name, address in addresses:
+        print(render_address_report(addr_name, address, states[address]), end="")
 
     print(f"{'='*60}")
     print("结论:")
@@ -172,8 +384,16 @@ def check_onchain_allowances():
     return True
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="直接检查链上的 allowance 状态")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"忽略本地 eth_call 缓存 ({RPC_CACHE_PATH})，强制查询 RPC"
+    )
+    args = parser.parse_args()
+
     try:
-        success = check_onchain_allowances()
+        success = asyncio.run(check_onchain_allowances(use_cache=not args.no_cache))
         sys.exit(0 if success else 1)
     except Exception as e:
         print(f"\nERROR: {e}")
@@ -8,6 +8,8 @@ Used to test limit order creation in proxy mode.
 import sys
 from pathlib import Path
 
+import orjson
+
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
@@ -116,8 +118,7 @@ def debug_create_limit_order(
         if result:
             print()
             print("Full response:")
-            import json
-            print(json.dumps(result, indent=2))
+            print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
 
         return True
 
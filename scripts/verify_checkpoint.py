@@ -18,15 +18,25 @@ def verify_checkpoint():
 
     DatabaseHandler.initialize_database(db_url)
 
-    # 查询所有检查点
-    checkpoints = WalletCheckpoint.select()
-
-    print(f"数据库中共有 {len(checkpoints)} 个检查点:")
-    for cp in checkpoints:
-        print(f"  钱包: {cp.wallet_address}")
-        print(f"  最后同步时间: {cp.last_synced_timestamp}")
-        print(f"  更新时间: {cp.updated_at}")
-        print()
+    # 先用 SELECT COUNT(*) 取总数，再流式遍历（iterator() 不缓存结果）
+    count = WalletCheckpoint.select().count()
+
+    print(f"数据库中共有 {count} 个检查点:")
+
+    # 只取需要的三列，dicts() 跳过模型实例构造
+    rows = WalletCheckpoint.select(
+        WalletCheckpoint.wallet_address,
+        WalletCheckpoint.last_synced_timestamp,
+        WalletCheckpoint.updated_at
+    ).dicts().iterator()
+
+    template = (
+        "  钱包: {wallet_address}\n"
+        "  最后同步时间: {last_synced_timestamp}\n"
+        "  更新时间: {updated_at}\n"
+    )
+    for row in rows:
+        print(template.format_map(row))
 
 if __name__ == "__main__":
     verify_checkpoint()
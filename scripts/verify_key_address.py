@@ -40,14 +40,16 @@ try:
     config_eoa = "0x7c194708d0b203b00c57c001cda31eeb8e961aa7".lower()
     config_proxy = "0x2173D82638Bd32328cc3A1118408A2a577ea2869".lower()
 
-    if derived_address.lower() == config_eoa:
+    match = {config_eoa: "EOA", config_proxy: "Proxy"}.get(derived_address.lower())
+
+    if match == "EOA":
         print("✓ 私钥匹配 EOA 地址 - 正确!")
         print()
         print("建议配置:")
         print("  signature_type: 2")
         print("  address: 0x7c194708d0b203b00c57c001cda31eeb8e961aa7  (EOA)")
         print("  proxy_address: 0x2173D82638Bd32328cc3A1118408A2a577ea2869  (Funder)")
-    elif derived_address.lower() == config_proxy:
+    elif match == "Proxy":
         print("✓ 私钥匹配 Proxy 地址")
         print()
         print("ERROR: 这不正常!")
@@ -5,6 +5,7 @@ Run with: python scripts/verify_refactor.py
 """
 
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Add project root to Python path
@@ -15,70 +16,65 @@ if str(project_root) not in sys.path:
 
 def test_core_imports():
     """Test core module imports."""
-    print("Testing core module imports...")
     try:
         from poly_boost.core.config_loader import load_config
         from poly_boost.core.wallet_monitor import WalletMonitor
         from poly_boost.core.copy_trader import CopyTrader
         from poly_boost.core.in_memory_activity_queue import InMemoryActivityQueue
-        print("✓ Core imports: OK")
-        return True
+        return True, None
     except Exception as e:
-        print(f"✗ Core imports failed: {e}")
-        return False
+        return False, str(e)
 
 
 def test_services_imports():
     """Test services layer imports."""
-    print("Testing services layer imports...")
     try:
         from poly_boost.services.position_service import PositionService
         from poly_boost.services.trading_service import TradingService
         from poly_boost.services.wallet_service import WalletService
-        print("✓ Services imports: OK")
-        return True
+        return True, None
     except Exception as e:
-        print(f"✗ Services imports failed: {e}")
-        return False
+        return False, str(e)
 
 
 def test_api_imports():
     """Test FastAPI imports."""
-    print("Testing FastAPI imports...")
     try:
         from poly_boost.api.main import app
         from poly_boost.api.routes import positions, trading, wallets
-        print("✓ FastAPI imports: OK")
-        return True
+        return True, None
     except Exception as e:
-        print(f"✗ FastAPI imports failed: {e}")
-        return False
+        return False, str(e)
 
 
 def test_bot_imports():
     """Test Telegram bot imports."""
-    print("Testing Telegram bot imports...")
     try:
         from poly_boost.bot.keyboards import get_main_menu_keyboard
         from poly_boost.bot.handlers.position_handler import show_positions_menu
         from poly_boost.bot.handlers.trading_handler import show_trading_menu
-        print("✓ Telegram bot imports: OK")
-        return True
+        return True, None
     except Exception as e:
-        print(f"✗ Telegram bot imports failed: {e}")
-        return False
+        return False, str(e)
 
 
 def test_cli_import():
     """Test CLI import."""
-    print("Testing CLI import...")
     try:
         from poly_boost import cli
-        print("✓ CLI import: OK")
-        return True
+        return True, None
     except Exception as e:
-        print(f"✗ CLI import failed: {e}")
-        return False
+        return False, str(e)
+
+
+# (summary name, label, check function)
+CHECKS = [
+    ("Core", "Core imports", test_core_imports),
+    ("Services", "Services imports", test_services_imports),
+    ("FastAPI", "FastAPI imports", test_api_imports),
+    ("Telegram Bot", "Telegram bot imports", test_bot_imports),
+    ("CLI", "CLI import", test_cli_import),
+]
 
 
 def main():
@@ -88,14 +84,20 @@ def main():
     print("=" * 60)
     print()
 
-    results = []
+    # Each check imports its own subtree in a separate process, so the
+    # cold imports run in parallel; results are reported in CHECKS order
+    with ProcessPoolExecutor(max_workers=len(CHECKS)) as executor:
+        futures = [executor.submit(check) for _, _, check in CHECKS]
+        outcomes = [future.result() for future in futures]
 
-    # Run all tests
-    results.append(("Core", test_core_imports()))
-    results.append(("Services", test_services_imports()))
-    results.append(("FastAPI", test_api_imports()))
-    results.append(("Telegram Bot", test_bot_imports()))
-    results.append(("CLI", test_cli_import()))
+    results = []
+    for (name, label, _), (passed, error) in zip(CHECKS, outcomes):
+        print(f"Testing {label}...")
+        if passed:
+            print(f"✓ {label}: OK")
+        else:
+            print(f"✗ {label} failed: {error}")
+        results.append((name, passed))
 
     # Summary
     print()
@@ -117,9 +119,9 @@ def main():
         print("Next steps:")
         print("1. Install dependencies: uv sync")
         print("2. Configure: config/config.yaml")
-        print("3. Run CLI: python run_cli.py")
+        print("3. Run CLI: python run.py cli")
         print("4. Run API: python run_api.py")
-        print("5. Run Bot: python run_bot.py")
+        print("5. Run Bot: python run.py bot")
         return 0
     else:
         print("✗ Some tests failed. Please check the errors above.")
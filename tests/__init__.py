@@ -1,9 +1 @@
 """Test suite for Polymarket Copy Trading Bot."""
-
-import sys
-from pathlib import Path
-
-# Add project root to Python path
-project_root = Path(__file__).parent.parent
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
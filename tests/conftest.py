@@ -0,0 +1,9 @@
+"""pytest configuration shared by the test suite."""
+
+import sys
+from pathlib import Path
+
+# Add project root to Python path (done once here for every test module)
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
@@ -2,15 +2,15 @@
 """测试代理模式的 API allowance 设置"""
 
 import sys
-import os
-
-# 添加项目根目录到 Python 路径
-sys.path.insert(0, os.path.dirname(__file__))
+import traceback
 
 from py_clob_client.client import ClobClient
 from py_clob_client.clob_types import BalanceAllowanceParams
 from poly_boost.core.config_loader import load_config, load_private_key
 
+# USDC 有 6 位小数，原始整数值乘以该系数得到美元金额
+_USDC_SCALE = 1e-6
+
 def test_api_allowance():
     """测试 API allowance 查询和设置"""
     try:
@@ -68,8 +68,8 @@ def test_api_allowance():
         balance_raw = result.get('balance', 0)
         allowance_raw = result.get('allowance', 0)
 
-        balance = float(balance_raw) / 1_000_000
-        allowance = float(allowance_raw) / 1_000_000
+        balance = int(balance_raw) * _USDC_SCALE
+        allowance = int(allowance_raw) * _USDC_SCALE
 
         print(f"Current Balance: ${balance:.2f} USDC")
         print(f"Current Allowance: ${allowance:.2f} USDC")
@@ -78,6 +78,8 @@ def test_api_allowance():
         if wallet.get('signature_type') == 2:
             print("\n=== Proxy Mode Allowance Check ===")
 
+            threshold = balance * 0.9
+
             if allowance == 0:
                 print("\nWARNING: Allowance is 0!")
                 print("\nFor proxy mode (signature_type=2), allowances MUST be set on-chain")
@@ -92,7 +94,7 @@ def test_api_allowance():
                 print("\nAfter completing these steps, the allowance should be > 0")
                 return False
 
-            elif allowance > 0 and allowance >= balance * 0.9:
+            elif allowance > 0 and allowance >= threshold:
                 print(f"SUCCESS: Allowance is sufficient (${allowance:.2f} >= ${balance:.2f})")
                 print("Your proxy wallet is ready for trading!")
 
@@ -112,7 +114,7 @@ def test_api_allowance():
 
                 result_after = client.get_balance_allowance(params)
                 new_allowance_raw = result_after.get('allowance', 0)
-                new_allowance = float(new_allowance_raw) / 1_000_000
+                new_allowance = int(new_allowance_raw) * _USDC_SCALE
                 print(f"Allowance after sync: ${new_allowance:.2f}")
 
         else:
@@ -125,7 +127,6 @@ def test_api_allowance():
     except Exception as e:
         print(f"\n=== Test FAILED ===")
         print(f"Error: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
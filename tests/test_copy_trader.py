@@ -9,10 +9,14 @@
 4. 交易规模计算（模拟）
 """
 
+import operator
+import os
 import sys
+from dataclasses import dataclass
 from datetime import datetime
 from typing import List
-from unittest.mock import Mock, MagicMock
+
+import pytest
 
 from poly_boost.core.in_memory_activity_queue import InMemoryActivityQueue
 from poly_boost.core.copy_trader import CopyTrader
@@ -21,6 +25,33 @@ from poly_boost.core.logger import setup_logger
 # 设置日志
 log = setup_logger(level=20)  # INFO 级别
 
+# 分隔线
+_BANNER = "=" * 60
+
+
+@dataclass(slots=True)
+class _FakeActivity:
+    """模拟的活动对象（只包含测试用到的字段）"""
+    type: str
+    cash_amount: float
+    condition_id: str
+    outcome: str
+    side: str
+    price: float
+    size: float
+    title: str
+    timestamp: datetime
+
+
+# 过滤逻辑用到的两个字段，由 attrgetter 一次取出
+_FILTER_FIELDS = operator.attrgetter('type', 'cash_amount')
+
+
+def _should_process(activity, min_trigger: float = 50.0) -> bool:
+    """模拟 CopyTrader._should_process_activity：只处理达到触发金额的 TRADE"""
+    activity_type, cash_amount = _FILTER_FIELDS(activity)
+    return activity_type == 'TRADE' and cash_amount >= min_trigger
+
 
 def create_mock_activity(
     activity_type: str = "TRADE",
@@ -29,26 +60,26 @@ def create_mock_activity(
     outcome: str = "YES",
     side: str = "BUY",
     price: float = 0.5
-) -> Mock:
+) -> _FakeActivity:
     """创建模拟的活动对象"""
-    activity = Mock()
-    activity.type = activity_type
-    activity.cash_amount = cash_amount
-    activity.condition_id = condition_id
-    activity.outcome = outcome
-    activity.side = side
-    activity.price = price
-    activity.size = cash_amount / price if price > 0 else 0
-    activity.title = f"Test Market {condition_id[:8]}"
-    activity.timestamp = datetime.now()
-    return activity
+    return _FakeActivity(
+        type=activity_type,
+        cash_amount=cash_amount,
+        condition_id=condition_id,
+        outcome=outcome,
+        side=side,
+        price=price,
+        size=cash_amount / price if price > 0 else 0,
+        title=f"Test Market {condition_id[:8]}",
+        timestamp=datetime.now()
+    )
 
 
 def test_config_validation():
     """测试配置验证功能"""
-    log.info("=" * 60)
+    log.info(_BANNER)
     log.info("测试 1: 配置验证")
-    log.info("=" * 60)
+    log.info(_BANNER)
 
     from poly_boost.core.config_loader import _validate_user_wallets
 
@@ -93,126 +124,84 @@ def test_config_validation():
     return True
 
 
-def test_activity_filtering():
-    """测试活动过滤逻辑"""
-    log.info("=" * 60)
-    log.info("测试 2: 活动过滤逻辑")
-    log.info("=" * 60)
+# 私钥格式用例: (环境变量中的私钥, 是否有效, 说明)
+_PRIVATE_KEY_ENV = "POLY_BOOST_TEST_PRIVATE_KEY"
+_PRIVATE_KEY_CASES = (
+    ("0x" + "ab" * 32, True, "带 0x 前缀的有效私钥"),
+    ("ab" * 32, True, "不带前缀的有效私钥"),
+    ("0x" + "ab" * 31, False, "长度错误（62 个十六进制字符）"),
+    ("ab" * 31 + "ag", False, "包含非十六进制字符"),
+)
 
-    # 创建模拟的 CopyTrader（不初始化 ClobClient）
-    queue = InMemoryActivityQueue(max_workers=2)
-
-    wallet_config = {
-        'name': 'TestWallet',
-        'address': '0x123',
-        'private_key_env': 'FAKE_KEY',  # 这里不会真正使用
-        'copy_strategy': {
-            'min_trigger_amount': 50.0,
-            'max_trade_amount': 100.0,
-            'copy_mode': 'scale',
-            'scale_percentage': 10.0,
-            'order_type': 'market'
-        }
-    }
 
-    # Mock CopyTrader 的私钥加载
-    import os
-    os.environ['FAKE_KEY'] = '0x' + '0' * 64  # 设置假私钥
+@pytest.mark.parametrize("key,valid,description", _PRIVATE_KEY_CASES)
+def test_private_key_format(key, valid, description):
+    """测试 load_private_key 的私钥格式检查"""
+    from poly_boost.core.config_loader import load_private_key
 
+    wallet_config = {'name': 'TestWallet', 'private_key_env': _PRIVATE_KEY_ENV}
+    os.environ[_PRIVATE_KEY_ENV] = key
     try:
-        # 尝试创建 CopyTrader，但会因为无效私钥失败
-        # 这里我们只测试逻辑，不真正连接
-        pass
-    except Exception as e:
-        log.info(f"预期的初始化错误（测试环境）: {e}")
-
-    # 直接测试过滤逻辑
-    log.info("测试各种活动类型的过滤...")
-
-    # 模拟 _should_process_activity 方法
-    def should_process(activity, min_trigger=50.0):
-        # 只处理 TRADE 类型
-        if activity.type != 'TRADE':
-            return False
-
-        # 检查最小触发金额
-        cash_amount = activity.cash_amount
-        if cash_amount < min_trigger:
-            return False
-
-        return True
-
-    # 测试用例
-    test_cases = [
-        (create_mock_activity("TRADE", 100.0), True, "正常交易（100 USDC）"),
-        (create_mock_activity("TRADE", 30.0), False, "金额过低（30 USDC < 50触发阈值）"),
-        (create_mock_activity("SPLIT", 100.0), False, "非交易类型（SPLIT）"),
-        (create_mock_activity("MERGE", 100.0), False, "非交易类型（MERGE）"),
-        (create_mock_activity("TRADE", 50.0), True, "边界情况（正好 50 USDC）"),
-    ]
+        if valid:
+            assert load_private_key(wallet_config) == key, f"{description}: 应原样返回私钥"
+        else:
+            try:
+                load_private_key(wallet_config)
+            except ValueError:
+                pass
+            else:
+                raise AssertionError(f"{description}: 应该抛出 ValueError")
+    finally:
+        os.environ.pop(_PRIVATE_KEY_ENV, None)
+
+
+# 活动过滤用例: (活动, 是否应处理, 说明)，导入时生成一次
+_FILTER_CASES = (
+    (create_mock_activity("TRADE", 100.0), True, "正常交易（100 USDC）"),
+    (create_mock_activity("TRADE", 30.0), False, "金额过低（30 USDC < 50触发阈值）"),
+    (create_mock_activity("SPLIT", 100.0), False, "非交易类型（SPLIT）"),
+    (create_mock_activity("MERGE", 100.0), False, "非交易类型（MERGE）"),
+    (create_mock_activity("TRADE", 50.0), True, "边界情况（正好 50 USDC）"),
+)
+
+
+@pytest.mark.parametrize("activity,expected,description", _FILTER_CASES)
+def test_activity_filtering(activity, expected, description):
+    """测试活动过滤逻辑"""
+    assert _should_process(activity) == expected, description
 
-    all_passed = True
-    for activity, expected, description in test_cases:
-        result = should_process(activity)
-        status = "✓" if result == expected else "✗"
-        if result != expected:
-            all_passed = False
-        log.info(f"  {status} {description}: {'通过' if result else '过滤'}")
 
-    if all_passed:
-        log.info("✓ 所有过滤测试通过")
-    else:
-        log.error("✗ 部分过滤测试失败")
+def _calculate_scale(target_value, percentage, max_amount=0):
+    """Scale 模式交易规模（带最大金额限制）"""
+    calculated = target_value * (percentage / 100)
+    if max_amount > 0 and calculated > max_amount:
+        return max_amount
+    return calculated
 
-    log.info("")
-    return all_passed
-
-
-def test_trade_size_calculation():
-    """测试交易规模计算"""
-    log.info("=" * 60)
-    log.info("测试 3: 交易规模计算（含最大金额限制）")
-    log.info("=" * 60)
-
-    # Scale 模式测试（带最大金额限制）
-    def calculate_scale(target_value, percentage, max_amount=0):
-        calculated = target_value * (percentage / 100)
-        if max_amount > 0 and calculated > max_amount:
-            return max_amount
-        return calculated
-
-    test_cases = [
-        (100.0, 10.0, 0, 10.0, "10% of 100 = 10（无限制）"),
-        (250.0, 5.0, 0, 12.5, "5% of 250 = 12.5（无限制）"),
-        (50.0, 20.0, 0, 10.0, "20% of 50 = 10（无限制）"),
-        (1000.0, 10.0, 50.0, 50.0, "10% of 1000 = 100，限制为 50"),
-        (500.0, 20.0, 80.0, 80.0, "20% of 500 = 100，限制为 80"),
-        (200.0, 10.0, 100.0, 20.0, "10% of 200 = 20 < 100（不受限）"),
-    ]
 
-    all_passed = True
-    for target, percentage, max_amt, expected, description in test_cases:
-        result = calculate_scale(target, percentage, max_amt)
-        passed = abs(result - expected) < 0.01
-        status = "✓" if passed else "✗"
-        if not passed:
-            all_passed = False
-        log.info(f"  {status} {description}: ${result:.2f}")
-
-    if all_passed:
-        log.info("✓ 所有计算测试通过")
-    else:
-        log.error("✗ 部分计算测试失败")
+# 交易规模用例: (目标金额, 比例, 最大金额, 期望结果, 说明)
+_SCALE_CASES = (
+    (100.0, 10.0, 0, 10.0, "10% of 100 = 10（无限制）"),
+    (250.0, 5.0, 0, 12.5, "5% of 250 = 12.5（无限制）"),
+    (50.0, 20.0, 0, 10.0, "20% of 50 = 10（无限制）"),
+    (1000.0, 10.0, 50.0, 50.0, "10% of 1000 = 100，限制为 50"),
+    (500.0, 20.0, 80.0, 80.0, "20% of 500 = 100，限制为 80"),
+    (200.0, 10.0, 100.0, 20.0, "10% of 200 = 20 < 100（不受限）"),
+)
 
-    log.info("")
-    return all_passed
+
+@pytest.mark.parametrize("target,percentage,max_amount,expected,description", _SCALE_CASES)
+def test_trade_size_calculation(target, percentage, max_amount, expected, description):
+    """测试交易规模计算（含最大金额限制）"""
+    result = _calculate_scale(target, percentage, max_amount)
+    assert abs(result - expected) < 0.01, f"{description}: ${result:.2f}"
 
 
 def test_mock_integration():
     """测试模拟集成流程"""
-    log.info("=" * 60)
+    log.info(_BANNER)
     log.info("测试 4: 模拟集成流程")
-    log.info("=" * 60)
+    log.info(_BANNER)
 
     # 创建队列
     queue = InMemoryActivityQueue(max_workers=2)
@@ -238,8 +227,7 @@ def test_mock_integration():
     queue.enqueue(target_wallet, mock_activities)
 
     # 等待异步处理
-    import time
-    time.sleep(1)
+    queue.flush()
 
     # 验证
     if len(collected_activities) == 3:
@@ -253,6 +241,28 @@ def test_mock_integration():
     return True
 
 
+def _run_cases(title: str, test_fn, cases) -> bool:
+    """脚本模式下逐条运行参数化用例，返回是否全部通过"""
+    log.info(_BANNER)
+    log.info(title)
+    log.info(_BANNER)
+
+    failures = []
+    for case in cases:
+        try:
+            test_fn(*case)
+        except AssertionError as e:
+            failures.append(f"  ✗ {e}")
+
+    if failures:
+        log.error("\n".join(failures))
+    else:
+        log.info(f"✓ 全部 {len(cases)} 个用例通过")
+
+    log.info("")
+    return not failures
+
+
 def main():
     """运行所有测试"""
     log.info("开始测试复制交易功能...\n")
@@ -261,22 +271,31 @@ def main():
 
     try:
         results.append(("配置验证", test_config_validation()))
-        results.append(("活动过滤", test_activity_filtering()))
-        results.append(("规模计算", test_trade_size_calculation()))
+        results.append((
+            "私钥格式",
+            _run_cases("测试 1b: 私钥格式检查", test_private_key_format, _PRIVATE_KEY_CASES)
+        ))
+        results.append(("活动过滤", _run_cases("测试 2: 活动过滤逻辑", test_activity_filtering, _FILTER_CASES)))
+        results.append((
+            "规模计算",
+            _run_cases("测试 3: 交易规模计算（含最大金额限制）", test_trade_size_calculation, _SCALE_CASES)
+        ))
         results.append(("模拟集成", test_mock_integration()))
 
-        log.info("=" * 60)
+        log.info(_BANNER)
         log.info("测试总结")
-        log.info("=" * 60)
+        log.info(_BANNER)
 
         all_passed = True
+        lines = []
         for name, passed in results:
             status = "✓ 通过" if passed else "✗ 失败"
-            log.info(f"  {name}: {status}")
+            lines.append(f"  {name}: {status}")
             if not passed:
                 all_passed = False
+        log.info("\n".join(lines))
 
-        log.info("=" * 60)
+        log.info(_BANNER)
 
         if all_passed:
             log.info("所有测试通过！✓")
@@ -8,7 +8,7 @@
 3. 多个订阅者的处理
 """
 
-import time
+import threading
 from datetime import datetime
 from typing import List
 
@@ -18,6 +18,9 @@ from poly_boost.core.logger import setup_logger
 # 设置日志
 log = setup_logger(level=20)  # INFO 级别
 
+# 分隔线
+_BANNER = "=" * 60
+
 
 class ActivityCollector:
     """收集活动的辅助类，用于测试"""
@@ -34,9 +37,9 @@ class ActivityCollector:
 
 def test_basic_queue():
     """测试基本队列功能"""
-    log.info("=" * 60)
+    log.info(_BANNER)
     log.info("测试 1: 基本队列功能")
-    log.info("=" * 60)
+    log.info(_BANNER)
 
     # 创建队列
     queue = InMemoryActivityQueue(max_workers=2)
@@ -50,12 +53,13 @@ def test_basic_queue():
     queue.subscribe(wallet, collector1.handle)
     queue.subscribe(wallet, collector2.handle)
 
-    # 模拟活动数据
+    # 模拟活动数据（时间戳只生成一次）
+    timestamp = datetime.now().isoformat()
     mock_activities = [
         {
             'transaction_hash': f'0xabc{i}',
             'market_id': f'market_{i}',
-            'timestamp': datetime.now().isoformat()
+            'timestamp': timestamp
         }
         for i in range(5)
     ]
@@ -65,7 +69,7 @@ def test_basic_queue():
     queue.enqueue(wallet, mock_activities)
 
     # 等待异步处理完成
-    time.sleep(1)
+    queue.flush()
 
     # 验证结果
     assert len(collector1.collected_activities) == 5, f"订阅者1应该收到5条活动，实际收到 {len(collector1.collected_activities)}"
@@ -80,9 +84,9 @@ def test_basic_queue():
 
 def test_multiple_wallets():
     """测试多个钱包"""
-    log.info("=" * 60)
+    log.info(_BANNER)
     log.info("测试 2: 多钱包订阅")
-    log.info("=" * 60)
+    log.info(_BANNER)
 
     queue = InMemoryActivityQueue(max_workers=2)
 
@@ -105,7 +109,7 @@ def test_multiple_wallets():
     queue.enqueue(wallet2, activities2)
 
     # 等待处理
-    time.sleep(1)
+    queue.flush()
 
     # 验证
     assert len(collector1.collected_activities) == 3, "钱包1订阅者应该收到3条活动"
@@ -119,9 +123,9 @@ def test_multiple_wallets():
 
 def test_no_subscribers():
     """测试没有订阅者的情况"""
-    log.info("=" * 60)
+    log.info(_BANNER)
     log.info("测试 3: 无订阅者场景")
-    log.info("=" * 60)
+    log.info(_BANNER)
 
     queue = InMemoryActivityQueue(max_workers=2)
 
@@ -133,7 +137,7 @@ def test_no_subscribers():
     queue.enqueue(wallet, activities)
 
     # 等待（虽然不应该有任何处理）
-    time.sleep(0.5)
+    queue.flush()
 
     log.info("✓ 测试通过：系统正常处理无订阅者情况（不会崩溃）")
 
@@ -143,9 +147,9 @@ def test_no_subscribers():
 
 def test_callback_exception():
     """测试回调函数抛出异常的情况"""
-    log.info("=" * 60)
+    log.info(_BANNER)
     log.info("测试 4: 回调异常处理")
-    log.info("=" * 60)
+    log.info(_BANNER)
 
     queue = InMemoryActivityQueue(max_workers=2)
 
@@ -166,7 +170,7 @@ def test_callback_exception():
     queue.enqueue(wallet, activities)
 
     # 等待处理
-    time.sleep(1)
+    queue.flush()
 
     # 验证正常订阅者仍然收到了活动
     assert len(collector.collected_activities) == 2, "正常订阅者应该收到活动"
@@ -177,6 +181,131 @@ def test_callback_exception():
     log.info("队列已关闭\n")
 
 
+def test_backpressure():
+    """测试待处理回调达到上限时生产者阻塞等待，通知不丢失"""
+    log.info(_BANNER)
+    log.info("测试 5: 待处理回调上限（阻塞生产者）")
+    log.info(_BANNER)
+
+    # 单个工作线程，最多 2 个待处理回调，默认无限等待空位
+    queue = InMemoryActivityQueue(max_workers=1, max_pending=2)
+
+    # 回调阻塞直到 release 被设置，使待处理任务堆积
+    release = threading.Event()
+    collector = ActivityCollector("阻塞订阅者")
+
+    def blocking_callback(activities: List[dict]):
+        release.wait(timeout=5)
+        collector.handle(activities)
+
+    wallet = "0xbackpressure"
+    queue.subscribe(wallet, blocking_callback)
+
+    # 生产者线程依次发布 3 批活动，前两批占满上限，第三批应阻塞
+    produced = threading.Event()
+
+    def producer():
+        for i in range(3):
+            assert queue.enqueue(wallet, [{'tx': f'bp_{i}'}])
+        produced.set()
+
+    producer_thread = threading.Thread(target=producer)
+    producer_thread.start()
+
+    assert not produced.wait(timeout=0.2), "待处理回调已满时生产者应阻塞"
+
+    # 放行回调后生产者继续，所有通知都应送达
+    release.set()
+    assert produced.wait(timeout=5), "回调完成后生产者应继续"
+    producer_thread.join()
+    queue.flush()
+
+    assert len(collector.collected_activities) == 3, \
+        f"应收到全部 3 条活动，实际收到 {len(collector.collected_activities)} 条"
+
+    log.info("✓ 测试通过：生产者被阻塞，通知未丢失")
+
+    queue.shutdown()
+    log.info("队列已关闭\n")
+
+
+def test_drop_on_timeout():
+    """测试显式设置 submit_timeout 时超时丢弃通知并返回 False"""
+    log.info(_BANNER)
+    log.info("测试 6: 等待超时丢弃通知（可选模式）")
+    log.info(_BANNER)
+
+    queue = InMemoryActivityQueue(max_workers=1, max_pending=2, submit_timeout=0.1)
+
+    release = threading.Event()
+    collector = ActivityCollector("阻塞订阅者")
+
+    def blocking_callback(activities: List[dict]):
+        release.wait(timeout=5)
+        collector.handle(activities)
+
+    wallet = "0xdrop"
+    queue.subscribe(wallet, blocking_callback)
+
+    # 前两次占满上限，第三次等待超时后被丢弃，调用方据此得知需要重新获取
+    results = [queue.enqueue(wallet, [{'tx': f'drop_{i}'}]) for i in range(3)]
+
+    release.set()
+    queue.flush()
+
+    assert results == [True, True, False], f"enqueue 返回值不符合预期: {results}"
+    assert len(collector.collected_activities) == 2, \
+        f"超时的通知应被丢弃，实际收到 {len(collector.collected_activities)} 条活动"
+
+    log.info("✓ 测试通过：超时通知被丢弃并报告给调用方")
+
+    queue.shutdown()
+    log.info("队列已关闭\n")
+
+
+def test_partial_timeout_is_all_or_nothing():
+    """测试多个订阅者时，空位不足的批次不会只投递给部分订阅者"""
+    log.info(_BANNER)
+    log.info("测试 7: 多订阅者超时时整批丢弃")
+    log.info(_BANNER)
+
+    # 最多 3 个待处理回调：第一批占用 2 个后只剩 1 个，不足以投递给 2 个订阅者
+    queue = InMemoryActivityQueue(max_workers=1, max_pending=3, submit_timeout=0.1)
+
+    release = threading.Event()
+    collector_a = ActivityCollector("订阅者A")
+    collector_b = ActivityCollector("订阅者B")
+
+    def blocking_callback(activities: List[dict]):
+        release.wait(timeout=5)
+        collector_a.handle(activities)
+
+    wallet = "0xpartial"
+    queue.subscribe(wallet, blocking_callback)
+    queue.subscribe(wallet, collector_b.handle)
+
+    assert queue.enqueue(wallet, [{'tx': 'first'}])
+    assert not queue.enqueue(wallet, [{'tx': 'second'}]), "空位不足时应整批丢弃并返回 False"
+
+    release.set()
+    queue.flush()
+
+    for collector in (collector_a, collector_b):
+        txs = [a['tx'] for a in collector.collected_activities]
+        assert txs == ['first'], f"{collector.name} 不应收到被丢弃的批次: {txs}"
+
+    # 超时时已预留的空位应全部归还，之后的批次可以正常投递
+    assert queue.enqueue(wallet, [{'tx': 'third'}])
+    queue.flush()
+    assert len(collector_a.collected_activities) == 2
+    assert len(collector_b.collected_activities) == 2
+
+    log.info("✓ 测试通过：批次要么投递给所有订阅者，要么全部不投递")
+
+    queue.shutdown()
+    log.info("队列已关闭\n")
+
+
 def main():
     """运行所有测试"""
     log.info("开始测试消息队列功能...\n")
@@ -186,10 +315,13 @@ def main():
         test_multiple_wallets()
         test_no_subscribers()
         test_callback_exception()
+        test_backpressure()
+        test_drop_on_timeout()
+        test_partial_timeout_is_all_or_nothing()
 
-        log.info("=" * 60)
+        log.info(_BANNER)
         log.info("所有测试通过！✓")
-        log.info("=" * 60)
+        log.info(_BANNER)
 
     except AssertionError as e:
         log.error(f"测试失败: {e}")
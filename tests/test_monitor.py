@@ -1,14 +1,20 @@
 """测试完整的监控流程（模拟分页获取）"""
-import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
 from poly_boost.core.config_loader import load_config
-from poly_boost.core.wallet_monitor import WalletMonitor
+from poly_boost.core.in_memory_activity_queue import InMemoryActivityQueue
 from poly_boost.core.logger import log
 
 def test_monitor():
     """测试钱包监控"""
+    # WalletMonitor 依赖 polymarket_apis / httpx，按需导入以加快测试收集
+    from poly_boost.core.wallet_monitor import WalletMonitor
+
     config = load_config("config.yaml")
 
-    db_url = config['database']['url']
     wallets = config['monitoring']['wallets']
     batch_size = 10  # 使用小批次测试分页逻辑
 
@@ -18,7 +24,7 @@ def test_monitor():
     monitor = WalletMonitor(
         wallets=wallets,
         poll_interval=300,  # 5分钟轮询一次（测试时只运行一轮）
-        db_url=db_url,
+        activity_queue=InMemoryActivityQueue(),
         batch_size=batch_size,
         proxy=config.get('polymarket_api', {}).get('proxy')
     )
@@ -26,13 +32,64 @@ def test_monitor():
     # 启动监控
     monitor.start()
 
-    # 等待10秒让第一轮完成
+    # 等待第一轮完成（最多 30 秒），而不是固定休眠
     log.info("等待第一轮监控完成...")
-    time.sleep(10)
-
-    # 停止监控
-    monitor.stop()
+    try:
+        assert monitor.wait_first_cycle(timeout=30), "第一轮监控未在 30 秒内完成"
+    finally:
+        # 停止监控
+        monitor.stop()
     log.info("测试完成")
 
+class _FakeDataClient:
+    """每次都返回同一批活动的数据客户端，记录每次请求的起始时间"""
+
+    def __init__(self, activities):
+        self.activities = activities
+        self.requested_starts = []
+
+    def get_activity(self, **params):
+        self.requested_starts.append(params["start"])
+        return self.activities if params["offset"] == 0 else []
+
+
+class _FlakyQueue:
+    """按顺序返回预设投递结果的活动队列"""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.enqueued = []
+
+    def enqueue(self, wallet_address, activities):
+        self.enqueued.append(list(activities))
+        return self.results.pop(0)
+
+
+def test_undelivered_batch_is_refetched():
+    """测试批次未投递时检查点不前移，下一轮重新获取同一批活动"""
+    pytest.importorskip("polymarket_apis")
+    from poly_boost.core.wallet_monitor import WalletMonitor
+
+    checkpoint = datetime(2024, 1, 1, 12, 0, 0)
+    activity = SimpleNamespace(type="TRADE", timestamp=checkpoint + timedelta(minutes=5))
+
+    # 绕过构造函数，避免创建真实的 API 客户端
+    monitor = WalletMonitor.__new__(WalletMonitor)
+    monitor.batch_size = 10
+    monitor.data_client = _FakeDataClient([activity])
+    monitor.activity_queue = _FlakyQueue([False, True])
+
+    # 第一轮：队列拒绝该批次，不计数也不返回新的检查点
+    total, updated = monitor._fetch_and_publish_activities("0xwallet", checkpoint)
+    assert (total, updated) == (0, None)
+
+    # 第二轮：从原检查点重新获取，投递成功后检查点前移
+    total, updated = monitor._fetch_and_publish_activities("0xwallet", checkpoint)
+    assert total == 1
+    assert updated is not None and updated > checkpoint.replace(tzinfo=updated.tzinfo)
+
+    assert monitor.data_client.requested_starts == [checkpoint, checkpoint]
+    assert monitor.activity_queue.enqueued == [[activity], [activity]]
+
 if __name__ == "__main__":
     test_monitor()
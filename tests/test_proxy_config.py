@@ -1,70 +1,62 @@
 #!/usr/bin/env python3
 """测试代理模式配置"""
 
-import sys
 import os
+import sys
 
-# 添加项目根目录到 Python 路径
-sys.path.insert(0, os.path.dirname(__file__))
+import pytest
 
 from poly_boost.core.config_loader import load_config
 
-def test_proxy_config():
-    """测试代理配置加载"""
+
+@pytest.fixture(scope="module")
+def config():
+    # config/config.yaml 不在版本库中，未提供配置的环境（如 CI）跳过
     try:
-        print("Loading config...")
-        config = load_config()
-
-        print("\n=== Configuration Test ===")
-
-        # 检查用户钱包配置
-        if 'user_wallets' not in config or not config['user_wallets']:
-            print("ERROR: No user wallets configured")
-            return False
-
-        wallet = config['user_wallets'][0]
-
-        print(f"\nWallet Configuration:")
-        print(f"  Name: {wallet['name']}")
-        print(f"  Address: {wallet['address']}")
-        print(f"  Proxy Address: {wallet.get('proxy_address', 'NOT SET')}")
-        print(f"  Signature Type: {wallet.get('signature_type', 0)}")
-        print(f"  Private Key Env: {wallet.get('private_key_env', 'NOT SET')}")
-
-        # 验证代理模式配置
-        sig_type = wallet.get('signature_type', 0)
-        proxy_addr = wallet.get('proxy_address')
-
-        if sig_type == 2:
-            if not proxy_addr:
-                print("\nERROR: signature_type=2 requires proxy_address")
-                return False
-            print(f"\nSUCCESS: Proxy mode configured correctly")
-            print(f"  - EOA Wallet: {wallet['address']}")
-            print(f"  - Proxy Contract (Funder): {proxy_addr}")
-        elif sig_type == 0:
-            print(f"\nINFO: Using standard EOA mode (signature_type=0)")
-        else:
-            print(f"\nWARNING: Unexpected signature_type: {sig_type}")
-
-        # 检查私钥环境变量
-        env_var = wallet.get('private_key_env')
-        if env_var:
-            if os.environ.get(env_var):
-                print(f"  - Private key environment variable '{env_var}' is SET")
-            else:
-                print(f"  - WARNING: Private key environment variable '{env_var}' is NOT SET")
-
-        print("\n=== Test PASSED ===")
-        return True
-
-    except Exception as e:
-        print(f"\n=== Test FAILED ===")
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        return load_config()
+    except FileNotFoundError as e:
+        pytest.skip(f"Configuration file not found: {e}")
+
+
+@pytest.fixture(scope="module")
+def wallet(config):
+    """第一个用户钱包配置"""
+    user_wallets = config.get('user_wallets')
+    if not user_wallets:
+        pytest.skip("No user wallets configured")
+    return user_wallets[0]
+
+
+def test_wallet_present(config):
+    """配置中至少有一个用户钱包，且包含名称和地址"""
+    user_wallets = config.get('user_wallets')
+    assert user_wallets, "No user wallets configured"
+
+    wallet = user_wallets[0]
+    assert wallet.get('name'), "Wallet name is not set"
+    assert wallet.get('address'), "Wallet address is not set"
+
+
+def test_signature_type_requires_proxy_address(wallet):
+    """代理模式 (signature_type=2) 必须配置 proxy_address"""
+    sig_type = wallet.get('signature_type', 0)
+    # 与 config_loader 的校验保持一致：0、1、2 均为合法值
+    assert sig_type in (0, 1, 2), f"Unexpected signature_type: {sig_type}"
+
+    if sig_type == 2:
+        assert wallet.get('proxy_address'), "signature_type=2 requires proxy_address"
+
+
+def test_private_key_env_set(wallet):
+    """配置的私钥环境变量已设置（未提供密钥的环境中跳过）"""
+    env_var = wallet.get('private_key_env')
+    if not env_var:
+        pytest.skip("private_key_env is not configured")
+    if not os.environ.get(env_var):
+        pytest.skip(f"Private key environment variable '{env_var}' is NOT SET")
+
+    assert os.environ[env_var].strip(), f"Private key environment variable '{env_var}' is empty"
+
 
 if __name__ == "__main__":
-    success = test_proxy_config()
-    sys.exit(0 if success else 1)
+    sys.exit(pytest.main([__file__, "-v"]))
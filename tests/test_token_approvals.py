@@ -7,181 +7,269 @@
 3. CopyTrader 初始化时正确检查和设置授权
 """
 
+import functools
 import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 from dotenv import load_dotenv
-from web3 import Web3
 
 # 加载环境变量
 load_dotenv()
 
-# 从 copy_trader.py 导入常量
-from poly_boost.core.copy_trader import (
-    POLYGON_RPC_URL,
-    USDC_ADDRESS,
-    CONDITIONAL_TOKENS_ADDRESS,
-    EXCHANGE_ADDRESSES,
-    ERC20_ABI,
-    ERC1155_ABI
+# web3 和 copy_trader（及其中的合约常量）导入开销较大，放到函数内按需导入，
+# 测试被跳过或未选中时收集阶段不必加载
+
+# 分隔线
+_BANNER = "=" * 60
+
+# 以下测试需要访问 Polygon RPC，默认跳过，设置 RUN_RPC_TESTS=1 后启用
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("RUN_RPC_TESTS"),
+    reason="需要网络访问，设置 RUN_RPC_TESTS=1 启用"
 )
 
-def test_web3_connection():
+# 两项授权扫描在脚本模式下并发执行，各自的输出整块打印，避免交错
+_print_lock = threading.Lock()
+
+def _emit(lines):
+    with _print_lock:
+        print("\n".join(lines))
+
+# 地址校验和计算需要 keccak 哈希，缓存后同一地址在各项测试间只计算一次
+@functools.lru_cache(maxsize=256)
+def _checksum(address):
+    from web3 import Web3
+    return Web3.to_checksum_address(address)
+
+@functools.cache
+def _exchange_labels():
+    """打印用的交易所地址短标签，与 EXCHANGE_ADDRESSES 一一对应，只计算一次"""
+    from poly_boost.core.copy_trader import EXCHANGE_ADDRESSES
+    return tuple(address[:10] for address in EXCHANGE_ADDRESSES)
+
+def _batch_call(w3, calls):
+    """将多个合约只读调用合并为一次 JSON-RPC 批量请求，按顺序返回结果"""
+    with w3.batch_requests() as batch:
+        for call in calls:
+            batch.add(call)
+        return batch.execute()
+
+def _connect_web3():
+    """创建 Web3 客户端，整个模块共用同一个 HTTP 会话（连接复用）"""
+    from web3 import Web3
+    from poly_boost.core.copy_trader import POLYGON_RPC_URL
+    return Web3(Web3.HTTPProvider(POLYGON_RPC_URL, request_kwargs={"timeout": 10}))
+
+# 合约类（未绑定地址）按 Web3 实例缓存，ABI 只解析一次，之后按地址实例化
+@functools.cache
+def _erc20_factory(w3):
+    from poly_boost.core.copy_trader import ERC20_ABI
+    return w3.eth.contract(abi=ERC20_ABI)
+
+@functools.cache
+def _erc1155_factory(w3):
+    from poly_boost.core.copy_trader import ERC1155_ABI
+    return w3.eth.contract(abi=ERC1155_ABI)
+
+def _usdc_contract(w3):
+    from poly_boost.core.copy_trader import USDC_ADDRESS
+    return _erc20_factory(w3)(address=_checksum(USDC_ADDRESS))
+
+def _ct_contract(w3):
+    from poly_boost.core.copy_trader import CONDITIONAL_TOKENS_ADDRESS
+    return _erc1155_factory(w3)(address=_checksum(CONDITIONAL_TOKENS_ADDRESS))
+
+def _load_test_config():
+    from poly_boost.core.config_loader import load_config
+    return load_config("config.yaml")
+
+
+# ---- pytest fixtures（模块级，Web3 连接、合约对象和配置只创建一次）----
+
+@pytest.fixture(scope="module")
+def w3():
+    return _connect_web3()
+
+@pytest.fixture(scope="module")
+def usdc_contract(w3):
+    return _usdc_contract(w3)
+
+@pytest.fixture(scope="module")
+def ct_contract(w3):
+    return _ct_contract(w3)
+
+@pytest.fixture(scope="module")
+def config():
+    return _load_test_config()
+
+@pytest.fixture(scope="module")
+def wallet_address(config):
+    user_wallets = config.get('user_wallets', [])
+    if not user_wallets:
+        pytest.skip("配置文件中未找到用户钱包配置")
+    return user_wallets[0]['address']
+
+
+def test_web3_connection(w3):
     """测试 Web3 连接"""
-    print("=" * 60)
+    print(_BANNER)
     print("测试 1: Web3 连接到 Polygon 网络")
-    print("=" * 60)
+    print(_BANNER)
 
-    w3 = Web3(Web3.HTTPProvider(POLYGON_RPC_URL))
+    assert w3.is_connected(), "无法连接到 Polygon 网络"
 
-    if w3.is_connected():
-        print(f"✓ 成功连接到 Polygon 网络")
-        print(f"  Chain ID: {w3.eth.chain_id}")
-        print(f"  Latest Block: {w3.eth.block_number}")
-        return w3
-    else:
-        print(f"✗ 无法连接到 Polygon 网络")
-        return None
+    print(f"✓ 成功连接到 Polygon 网络")
+    print(f"  Chain ID: {w3.eth.chain_id}")
+    print(f"  Latest Block: {w3.eth.block_number}")
 
-def test_usdc_allowances(w3, wallet_address):
+def test_usdc_allowances(w3, usdc_contract, wallet_address):
     """测试 USDC 授权状态"""
-    print("\n" + "=" * 60)
-    print("测试 2: 查询 USDC 授权状态")
-    print("=" * 60)
-
-    usdc_contract = w3.eth.contract(
-        address=Web3.to_checksum_address(USDC_ADDRESS),
-        abi=ERC20_ABI
-    )
-
-    print(f"USDC 合约地址: {USDC_ADDRESS}")
-    print(f"钱包地址: {wallet_address}")
-    print()
-
-    for i, exchange_address in enumerate(EXCHANGE_ADDRESSES, 1):
-        try:
-            allowance = usdc_contract.functions.allowance(
-                Web3.to_checksum_address(wallet_address),
-                Web3.to_checksum_address(exchange_address)
-            ).call()
-
-            if allowance > 0:
-                print(f"  [{i}] {exchange_address[:10]}... ✓ 已授权 (额度: {allowance})")
-            else:
-                print(f"  [{i}] {exchange_address[:10]}... ✗ 未授权 (额度: 0)")
-        except Exception as e:
-            print(f"  [{i}] {exchange_address[:10]}... ✗ 查询失败: {e}")
-
-def test_conditional_tokens_allowances(w3, wallet_address):
+    from poly_boost.core.copy_trader import USDC_ADDRESS, EXCHANGE_ADDRESSES
+
+    lines = [
+        "\n" + _BANNER,
+        "测试 2: 查询 USDC 授权状态",
+        _BANNER,
+        f"USDC 合约地址: {USDC_ADDRESS}",
+        f"钱包地址: {wallet_address}",
+        "",
+    ]
+
+    wallet_cs = _checksum(wallet_address)
+    allowances = _batch_call(w3, [
+        usdc_contract.functions.allowance(wallet_cs, _checksum(exchange_address))
+        for exchange_address in EXCHANGE_ADDRESSES
+    ])
+    assert len(allowances) == len(EXCHANGE_ADDRESSES)
+
+    for i, (label, allowance) in enumerate(zip(_exchange_labels(), allowances), 1):
+        if allowance > 0:
+            lines.append(f"  [{i}] {label}... ✓ 已授权 (额度: {allowance})")
+        else:
+            lines.append(f"  [{i}] {label}... ✗ 未授权 (额度: 0)")
+    _emit(lines)
+
+def test_conditional_tokens_allowances(w3, ct_contract, wallet_address):
     """测试 Conditional Tokens 授权状态"""
-    print("\n" + "=" * 60)
-    print("测试 3: 查询 Conditional Tokens 授权状态")
-    print("=" * 60)
-
-    ct_contract = w3.eth.contract(
-        address=Web3.to_checksum_address(CONDITIONAL_TOKENS_ADDRESS),
-        abi=ERC1155_ABI
-    )
-
-    print(f"Conditional Tokens 合约地址: {CONDITIONAL_TOKENS_ADDRESS}")
-    print(f"钱包地址: {wallet_address}")
-    print()
-
-    for i, exchange_address in enumerate(EXCHANGE_ADDRESSES, 1):
-        try:
-            is_approved = ct_contract.functions.isApprovedForAll(
-                Web3.to_checksum_address(wallet_address),
-                Web3.to_checksum_address(exchange_address)
-            ).call()
-
-            if is_approved:
-                print(f"  [{i}] {exchange_address[:10]}... ✓ 已授权")
-            else:
-                print(f"  [{i}] {exchange_address[:10]}... ✗ 未授权")
-        except Exception as e:
-            print(f"  [{i}] {exchange_address[:10]}... ✗ 查询失败: {e}")
-
-def test_copy_trader_initialization():
+    from poly_boost.core.copy_trader import CONDITIONAL_TOKENS_ADDRESS, EXCHANGE_ADDRESSES
+
+    lines = [
+        "\n" + _BANNER,
+        "测试 3: 查询 Conditional Tokens 授权状态",
+        _BANNER,
+        f"Conditional Tokens 合约地址: {CONDITIONAL_TOKENS_ADDRESS}",
+        f"钱包地址: {wallet_address}",
+        "",
+    ]
+
+    wallet_cs = _checksum(wallet_address)
+    approvals = _batch_call(w3, [
+        ct_contract.functions.isApprovedForAll(wallet_cs, _checksum(exchange_address))
+        for exchange_address in EXCHANGE_ADDRESSES
+    ])
+    assert len(approvals) == len(EXCHANGE_ADDRESSES)
+
+    for i, (label, is_approved) in enumerate(zip(_exchange_labels(), approvals), 1):
+        if is_approved:
+            lines.append(f"  [{i}] {label}... ✓ 已授权")
+        else:
+            lines.append(f"  [{i}] {label}... ✗ 未授权")
+    _emit(lines)
+
+def test_copy_trader_initialization(config):
     """测试 CopyTrader 初始化和授权检查"""
-    print("\n" + "=" * 60)
+    print("\n" + _BANNER)
     print("测试 4: CopyTrader 初始化和授权检查")
-    print("=" * 60)
+    print(_BANNER)
 
-    try:
-        from poly_boost.core.config_loader import load_config
-        from poly_boost.core.in_memory_activity_queue import InMemoryActivityQueue
-        from poly_boost.core.copy_trader import CopyTrader
+    from poly_boost.core.in_memory_activity_queue import InMemoryActivityQueue
+    from poly_boost.core.copy_trader import CopyTrader
 
-        # 加载配置
-        config = load_config("config.yaml")
-        user_wallets = config.get('user_wallets', [])
+    user_wallets = config.get('user_wallets', [])
+    assert user_wallets, "配置文件中未找到用户钱包配置"
 
-        if not user_wallets:
-            print("✗ 配置文件中未找到用户钱包配置")
-            return
+    # 创建活动队列
+    activity_queue = InMemoryActivityQueue(max_workers=1)
 
-        # 创建活动队列
-        activity_queue = InMemoryActivityQueue(max_workers=1)
+    # 初始化第一个钱包的 CopyTrader
+    wallet_config = user_wallets[0]
+    print(f"正在初始化钱包: {wallet_config['name']} ({wallet_config['address']})")
+    print()
 
-        # 初始化第一个钱包的 CopyTrader
-        wallet_config = user_wallets[0]
-        print(f"正在初始化钱包: {wallet_config['name']} ({wallet_config['address']})")
-        print()
+    trader = CopyTrader(
+        wallet_config=wallet_config,
+        activity_queue=activity_queue
+    )
 
-        trader = CopyTrader(
-            wallet_config=wallet_config,
-            activity_queue=activity_queue
-        )
+    assert trader.name == wallet_config['name']
+    assert trader.address == wallet_config['address']
 
-        print("\n✓ CopyTrader 初始化成功")
-        print(f"  钱包名称: {trader.name}")
-        print(f"  钱包地址: {trader.address}")
-        print(f"  复制模式: {trader.strategy_config['copy_mode']}")
+    print("\n✓ CopyTrader 初始化成功")
+    print(f"  钱包名称: {trader.name}")
+    print(f"  钱包地址: {trader.address}")
+    print(f"  复制模式: {trader.strategy_config['copy_mode']}")
 
+def _run_step(test_fn, *args):
+    """脚本模式下运行单项测试，失败时打印原因而不中断后续测试"""
+    try:
+        test_fn(*args)
+        return True
+    except AssertionError as e:
+        _emit([f"\n✗ {e}"])
     except Exception as e:
-        print(f"\n✗ CopyTrader 初始化失败: {e}")
-        import traceback
-        traceback.print_exc()
+        with _print_lock:
+            print(f"\n✗ {test_fn.__name__} 失败: {e}")
+            traceback.print_exc()
+    return False
 
 def main():
     """主测试流程"""
-    print("\n" + "=" * 60)
+    print("\n" + _BANNER)
     print("开始测试代币授权功能")
-    print("=" * 60)
+    print(_BANNER)
 
     # 测试 1: Web3 连接
-    w3 = test_web3_connection()
-    if not w3:
+    w3 = _connect_web3()
+    if not _run_step(test_web3_connection, w3):
         print("\n✗ Web3 连接失败，无法继续测试")
         return
 
-    # 从配置文件获取钱包地址
+    # 从配置文件获取钱包地址（各项测试自行处理查询失败，这里只保护配置加载）
     try:
-        from poly_boost.core.config_loader import load_config
-        config = load_config("config.yaml")
-        user_wallets = config.get('user_wallets', [])
-
-        if not user_wallets:
-            print("\n✗ 配置文件中未找到用户钱包配置")
-            return
-
-        wallet_address = user_wallets[0]['address']
-
-        # 测试 2: USDC 授权状态
-        test_usdc_allowances(w3, wallet_address)
-
-        # 测试 3: Conditional Tokens 授权状态
-        test_conditional_tokens_allowances(w3, wallet_address)
+        config = _load_test_config()
+    except Exception as e:
+        print(f"\n✗ 加载配置失败: {e}")
+        traceback.print_exc()
+        return
 
-        # 测试 4: CopyTrader 初始化
-        test_copy_trader_initialization()
+    user_wallets = config.get('user_wallets', [])
 
-        print("\n" + "=" * 60)
-        print("测试完成")
-        print("=" * 60)
+    if not user_wallets:
+        print("\n✗ 配置文件中未找到用户钱包配置")
+        return
 
-    except Exception as e:
-        print(f"\n✗ 测试失败: {e}")
-        import traceback
-        traceback.print_exc()
+    wallet_address = user_wallets[0]['address']
+
+    # 测试 2、3: USDC 和 Conditional Tokens 授权状态，两项扫描互相独立，并发查询
+    # batch_requests 会在 provider 上记录批处理状态，因此第二项扫描使用独立的 Web3 客户端
+    ct_w3 = _connect_web3()
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [
+            executor.submit(_run_step, test_usdc_allowances, w3, _usdc_contract(w3), wallet_address),
+            executor.submit(_run_step, test_conditional_tokens_allowances, ct_w3, _ct_contract(ct_w3), wallet_address),
+        ]
+        for future in futures:
+            future.result()
+
+    # 测试 4: CopyTrader 初始化
+    _run_step(test_copy_trader_initialization, config)
+
+    print("\n" + _BANNER)
+    print("测试完成")
+    print(_BANNER)
 
 if __name__ == "__main__":
     main()